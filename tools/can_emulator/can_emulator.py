@@ -16,13 +16,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
 import time
+import heapq
+import itertools
 import logging
 import json
 import os
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from copy import deepcopy
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass
 
 try:
     import can
@@ -31,6 +33,11 @@ except ImportError:
     CAN_AVAILABLE = False
     print("Warning: python-can not installed. Install with: pip install python-can")
 
+try:
+    import orjson  # Optional: faster config serialization
+except ImportError:
+    orjson = None
+
 from protocols import (
     CANMessage, MessageField, PROTOCOLS,
     get_protocol_messages, get_protocol_names
@@ -46,6 +53,41 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Preset vehicle states, keyed by field name (fields missing from a protocol are skipped)
+PRESETS = {
+    "idle": {
+        "rpm": 800, "throttle": 0, "tps": 0, "coolant": 85,
+        "oil_pressure": 3.5, "brake": 0, "clutch": 0, "ignition": 1,
+        "rev_limiter": 0, "als_active": 0, "speed": 0, "gear": 0
+    },
+    "cruise": {
+        "rpm": 3000, "throttle": 25, "tps": 25, "coolant": 90,
+        "oil_pressure": 4.5, "brake": 0, "clutch": 0, "ignition": 1,
+        "rev_limiter": 0, "als_active": 0, "speed": 80, "gear": 4
+    },
+    "acceleration": {
+        "rpm": 5500, "throttle": 100, "tps": 100, "coolant": 95,
+        "oil_pressure": 5.0, "brake": 0, "clutch": 0, "ignition": 1,
+        "rev_limiter": 0, "als_active": 0, "speed": 120, "gear": 3
+    },
+    "rev_limiter": {
+        "rpm": 6500, "throttle": 100, "tps": 100, "coolant": 100,
+        "oil_pressure": 5.5, "brake": 0, "clutch": 0, "ignition": 1,
+        "rev_limiter": 1, "als_active": 0, "speed": 150, "gear": 4
+    },
+    "cold_start": {
+        "rpm": 1200, "throttle": 0, "tps": 0, "coolant": 20,
+        "oil_pressure": 4.0, "brake": 0, "clutch": 0, "ignition": 1,
+        "rev_limiter": 0, "als_active": 0, "speed": 0, "gear": 0
+    },
+    "oil_warning": {
+        "rpm": 4000, "throttle": 50, "tps": 50, "coolant": 95,
+        "oil_pressure": 0.5, "brake": 0, "clutch": 0, "ignition": 1,
+        "rev_limiter": 0, "als_active": 0, "speed": 100, "gear": 3
+    },
+}
+
+
 @dataclass
 class MessageState:
     """Runtime state for a CAN message."""
@@ -54,39 +96,104 @@ class MessageState:
     interval_ms: int = 100
     values: Dict[str, float] = None
     order: int = 0
+    # Cached python-can frame; when `dirty` is set a new payload is encoded
+    # and swapped in, so a buffer already handed to send() is never mutated
+    msg_cache: Any = None
+    dirty: bool = True
+    # Field values the preview string was last rendered from
+    preview_values: Optional[tuple] = None
 
     def __post_init__(self):
         if self.values is None:
-            self.values = {f.name: f.default_value for f in self.message.fields}
+            self.values = self.message.default_values()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready settings for a saved config (the protocol schema is not stored)."""
+        return {
+            "enabled": self.enabled,
+            "interval_ms": self.interval_ms,
+            "values": self.values,
+        }
+
+    def update_from_dict(self, config: Dict[str, Any]):
+        """Apply settings produced by to_dict()."""
+        self.enabled = config.get("enabled", True)
+        self.interval_ms = config.get("interval_ms", 100)
+        self.values.update(config.get("values", {}))
+        self.dirty = True
 
 
 class TextHandler(logging.Handler):
-    """Logging handler that outputs to a tkinter Text widget."""
+    """Logging handler that outputs to a tkinter Text widget.
+
+    Records are queued and written by a single idle callback, so a burst of
+    log records costs one Text insert instead of one Tk callback each. The
+    widget keeps at most MAX_LINES lines: each flush drops exactly the
+    overflow from the top, like a ring buffer.
+    """
+
+    MAX_LINES = 1000
 
-    def __init__(self, text_widget: scrolledtext.ScrolledText):
+    def __init__(self, text_widget: scrolledtext.ScrolledText,
+                 autoscroll: Optional[Callable[[], bool]] = None):
         super().__init__()
         self.text_widget = text_widget
+        self.autoscroll = autoscroll
+        self._queue: deque = deque(maxlen=2000)
+        self._pending = False
+        self._line_count = 0
 
     def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.after(0, self._append, msg)
-
-    def _append(self, msg):
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, msg + '\n')
-        self.text_widget.see(tk.END)
-        self.text_widget.configure(state='disabled')
-        # Limit log size
-        lines = int(self.text_widget.index('end-1c').split('.')[0])
-        if lines > 1000:
-            self.text_widget.configure(state='normal')
-            self.text_widget.delete('1.0', '500.0')
-            self.text_widget.configure(state='disabled')
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._queue.append(msg)
+        if not self._pending:
+            self._pending = True
+            self.text_widget.after_idle(self._flush)
+
+    def _flush(self):
+        # Reset before draining so a record queued meanwhile schedules a new flush
+        self._pending = False
+        queue = self._queue
+        batch = []
+        while queue:
+            batch.append(queue.popleft())
+        if not batch:
+            return
+
+        text = '\n'.join(batch) + '\n'
+        self._line_count += text.count('\n')
+
+        widget = self.text_widget
+        # Only follow the tail if enabled and the user hasn't scrolled up
+        follow = (self.autoscroll is None or self.autoscroll()) and widget.yview()[1] >= 1.0
+
+        widget.configure(state='normal')
+        widget.insert(tk.END, text)
+        overflow = self._line_count - self.MAX_LINES
+        if overflow > 0:
+            widget.delete('1.0', f'{overflow + 1}.0')
+            self._line_count = self.MAX_LINES
+        widget.configure(state='disabled')
+
+        if follow:
+            widget.see(tk.END)
+
+    def reset(self):
+        """Forget the line count after the widget has been cleared."""
+        self._line_count = 0
 
 
 class CANEmulatorApp:
     """Main CAN Emulator Application."""
 
+    STATS_INTERVAL_MS = 100
+    PREVIEW_INTERVAL_MS = 33  # ~30 Hz cap on preview/cyclic task refreshes
+    RETIME_DEBOUNCE_MS = 100  # settle time before a cyclic task is restarted with a new period
+
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("CAN Bus Emulator - CANBUS LED Controller")
@@ -97,13 +204,35 @@ class CANEmulatorApp:
         self.can_bus: Optional[can.Bus] = None
         self.sending = False
         self.send_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # (deadline_ns, sequence rank, msg_id, state); the unique msg_id keeps
+        # ties from ever comparing states
+        self._schedule: List[Tuple[int, int, int, MessageState]] = []
+        # msg_id -> position in send_sequence; replaced as a whole on reorder
+        # so the sender thread picks up a consistent ranking
+        self._sequence_rank: Dict[int, int] = {}
+        self._tasks: Dict[int, Any] = {}  # msg_id -> python-can cyclic task (driver-timed mode)
+        self._retime_jobs: Dict[int, str] = {}  # msg_id -> pending after() id for a period change
+        self._driver_timed = False
         self.message_states: Dict[int, MessageState] = {}
         self.current_protocol = "Custom Protocol"
         self.send_sequence: List[int] = []  # Message IDs in send order
 
+        # Messages whose field values changed since the last preview refresh
+        self._preview_pending: Set[int] = set()
+        self._preview_job: Optional[str] = None
+
         # Statistics
+        # messages_sent is written only from the counter, whose next() is atomic
+        # under the GIL, so the sender thread and Reset Stats cannot tear it
         self.messages_sent = 0
-        self.last_send_time = 0
+        self._sent_counter = itertools.count(1)
+        # (time, messages_sent) samples; the rate is averaged over this sliding window
+        self._rate_window: deque = deque(maxlen=32)
+
+        # TX logging is sampled: only every Nth transmitted frame is logged
+        self._log_tx_every_n = 10
+        self._tx_counter = 0
 
         # Build UI
         self._create_menu()
@@ -114,6 +243,9 @@ class CANEmulatorApp:
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
+        # Statistics are refreshed on a fixed timer, not per transmitted frame
+        self._schedule_stats()
+
     def _create_menu(self):
         """Create menu bar."""
         menubar = tk.Menu(self.root)
@@ -248,6 +380,19 @@ class CANEmulatorApp:
         self.send_once_btn = ttk.Button(btn_frame2, text="Send Once", command=self._send_once)
         self.send_once_btn.pack(side=tk.LEFT, padx=5)
 
+        # Driver-timed mode hands each message to bus.send_periodic() so the
+        # interface (SocketCAN BCM, adapter firmware, ...) does the timing.
+        self.driver_timed_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(tx_frame, text="Driver-timed (send_periodic)",
+                        variable=self.driver_timed_var).grid(row=2, column=0, columnspan=3, sticky=tk.W)
+
+        # TX log sampling (the Tk log cannot keep up with every frame at high rates)
+        ttk.Label(tx_frame, text="Log every Nth TX:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.log_tx_every_var = tk.StringVar(value=str(self._log_tx_every_n))
+        ttk.Spinbox(tx_frame, from_=1, to=1000, textvariable=self.log_tx_every_var,
+                    width=10).grid(row=3, column=1, sticky=tk.W, pady=2, padx=5)
+        self.log_tx_every_var.trace_add('write', lambda *_: self._on_log_tx_every_change())
+
         # Statistics
         stats_frame = ttk.LabelFrame(parent, text="Statistics", padding=10)
         stats_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -268,25 +413,54 @@ class CANEmulatorApp:
         scrollbar = ttk.Scrollbar(msg_frame, orient=tk.VERTICAL, command=canvas.yview)
         self.messages_frame = ttk.Frame(canvas)
 
-        self.messages_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        self._scroll_pending = False
+        self.messages_frame.bind("<Configure>", self._on_messages_frame_configure)
 
         canvas.create_window((0, 0), window=self.messages_frame, anchor=tk.NW)
         canvas.configure(yscrollcommand=scrollbar.set)
 
-        # Mouse wheel scrolling
+        # Mouse wheel scrolling, bound only while the pointer is over the
+        # canvas so wheel events in the log don't scroll the message list
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        def _on_enter(event):
+            canvas.bind_all("<MouseWheel>", _on_mousewheel)
+            canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
+            canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
+
+        def _on_leave(event):
+            # Moving onto a child widget also sends <Leave> to the canvas
+            inside = canvas.winfo_containing(event.x_root, event.y_root)
+            if inside is not None and str(inside).startswith(str(canvas)):
+                return
+            canvas.unbind_all("<MouseWheel>")
+            canvas.unbind_all("<Button-4>")
+            canvas.unbind_all("<Button-5>")
+
+        canvas.bind("<Enter>", _on_enter)
+        canvas.bind("<Leave>", _on_leave)
 
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         self.message_canvas = canvas
         self.message_widgets: Dict[int, Dict[str, Any]] = {}
+        # Field name -> every (state, Tk variable) carrying that field in the current protocol
+        self._field_index: Dict[str, List[Tuple[MessageState, tk.Variable]]] = {}
+        self._preset_plans: Dict[str, tuple] = {}
+
+    def _on_messages_frame_configure(self, event):
+        """Coalesce <Configure> bursts into one scrollregion update per idle slice."""
+        if self._scroll_pending:
+            return
+        self._scroll_pending = True
+        self.root.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        """Fit the canvas scrollregion to the message widgets."""
+        self._scroll_pending = False
+        self.message_canvas.configure(scrollregion=self.message_canvas.bbox("all"))
 
     def _create_sequence_log_panel(self, parent):
         """Create sequence ordering and log panel."""
@@ -330,17 +504,22 @@ class CANEmulatorApp:
 
     def _setup_logging(self):
         """Setup logging to text widget."""
-        handler = TextHandler(self.log_text)
-        handler.setFormatter(logging.Formatter('%(asctime)s.%(msecs)03d %(message)s', '%H:%M:%S'))
-        logger.addHandler(handler)
+        self._log_handler = TextHandler(self.log_text, autoscroll=self.autoscroll_var.get)
+        self._log_handler.setFormatter(logging.Formatter('%(asctime)s.%(msecs)03d %(message)s', '%H:%M:%S'))
+        logger.addHandler(self._log_handler)
 
     def _load_protocol(self, protocol_name: str):
         """Load messages for selected protocol."""
+        # The send loop and periodic tasks hold the old states
+        if self.sending:
+            self._stop_sending()
+
         # Clear existing widgets
         for widget in self.messages_frame.winfo_children():
             widget.destroy()
         self.message_widgets.clear()
         self.message_states.clear()
+        self._field_index.clear()
         self.send_sequence.clear()
 
         messages = get_protocol_messages(protocol_name)
@@ -349,17 +528,36 @@ class CANEmulatorApp:
             state = MessageState(message=msg, order=idx)
             self.message_states[msg.id] = state
             self.send_sequence.append(msg.id)
-            self._create_message_widget(msg, idx)
+            self._create_message_widget(state, idx)
 
+        self._build_preset_plans()
         self._update_sequence_listbox()
         self.current_protocol = protocol_name
 
-    def _create_message_widget(self, msg: CANMessage, row: int):
+    def _build_preset_plans(self):
+        """Resolve every preset against the loaded protocol's widgets once.
+
+        Each plan is a tuple of (state, field, value, Tk variable, widget value)
+        assignments, so applying a preset is a flat walk with no lookups or
+        type checks.
+        """
+        self._preset_plans.clear()
+        for preset_name, preset in PRESETS.items():
+            assignments = []
+            for name, value in preset.items():
+                for state, var in self._field_index.get(name, ()):
+                    var_value = bool(value) if isinstance(var, tk.BooleanVar) else value
+                    assignments.append((state, name, value, var, var_value))
+            self._preset_plans[preset_name] = tuple(assignments)
+
+    def _create_message_widget(self, state: MessageState, row: int):
         """Create widget for a single CAN message."""
+        msg = state.message
         frame = ttk.LabelFrame(self.messages_frame, text=f"0x{msg.id:03X} - {msg.name}", padding=5)
         frame.pack(fill=tk.X, padx=5, pady=3)
 
-        widgets = {'frame': frame, 'fields': {}}
+        # 'setters' holds one value -> widget setter per field, resolved by var type here
+        widgets = {'frame': frame, 'fields': {}, 'setters': {}}
 
         # Header row with enable checkbox and interval
         header = ttk.Frame(frame)
@@ -397,23 +595,25 @@ class CANEmulatorApp:
             if field.max_value <= 1 and field.min_value >= 0:
                 # Boolean field - use checkbox
                 var = tk.BooleanVar(value=bool(field.default_value))
+                setter = lambda v, s=var.set: s(bool(v))
                 widget = ttk.Checkbutton(field_frame, variable=var,
-                                          command=lambda f=field, v=var, m=msg: self._on_field_change(m.id, f.name, float(v.get())))
+                                          command=lambda f=field, v=var, st=state: self._on_field_change(st, f.name, float(v.get())))
             else:
                 # Numeric field - use scale and spinbox
                 var = tk.DoubleVar(value=field.default_value)
+                setter = var.set
 
                 # Scale widget
                 scale = ttk.Scale(field_frame, from_=field.min_value, to=field.max_value,
                                   variable=var, orient=tk.HORIZONTAL, length=100,
-                                  command=lambda v, f=field, m=msg: self._on_field_change(m.id, f.name, float(v)))
+                                  command=lambda v, f=field, st=state: self._on_field_change(st, f.name, float(v)))
                 scale.pack(side=tk.LEFT, padx=2)
 
                 # Spinbox for precise control
                 step = 1 if field.scale == 1 else 0.1
                 spin = ttk.Spinbox(field_frame, from_=field.min_value, to=field.max_value,
                                    textvariable=var, width=6, increment=step,
-                                   command=lambda f=field, v=var, m=msg: self._on_field_change(m.id, f.name, v.get()))
+                                   command=lambda f=field, v=var, st=state: self._on_field_change(st, f.name, v.get()))
                 spin.pack(side=tk.LEFT, padx=2)
                 widget = spin
 
@@ -422,6 +622,8 @@ class CANEmulatorApp:
                 ttk.Label(field_frame, text=field.unit, foreground='gray').pack(side=tk.LEFT)
 
             widgets['fields'][field.name] = var
+            widgets['setters'][field.name] = setter
+            self._field_index.setdefault(field.name, []).append((state, var))
             col += 1
 
         # Preview - show raw CAN data
@@ -437,16 +639,47 @@ class CANEmulatorApp:
         self.message_widgets[msg.id] = widgets
         self._update_preview(msg.id)
 
-    def _on_field_change(self, msg_id: int, field_name: str, value: float):
-        """Handle field value change."""
-        if msg_id in self.message_states:
-            self.message_states[msg_id].values[field_name] = value
+    def _on_field_change(self, state: MessageState, field_name: str, value: float):
+        """Handle field value change.
+
+        The value is stored immediately (the send loop picks it up via
+        `dirty`), but preview and cyclic task refreshes are coalesced so a
+        scale drag costs at most one refresh per PREVIEW_INTERVAL_MS.
+        """
+        state.values[field_name] = value
+        state.dirty = True
+        self._queue_preview(state.message.id)
+
+    def _queue_preview(self, msg_id: int):
+        """Mark a message for the next coalesced preview/cyclic task refresh."""
+        self._preview_pending.add(msg_id)
+        if self._preview_job is None:
+            self._preview_job = self.root.after(self.PREVIEW_INTERVAL_MS, self._flush_previews)
+
+    def _flush_previews(self):
+        """Refresh previews and cyclic tasks of messages edited since the last flush."""
+        self._preview_job = None
+        pending, self._preview_pending = self._preview_pending, set()
+        for msg_id in pending:
             self._update_preview(msg_id)
+            self._update_periodic_task(msg_id)
 
     def _on_message_enable(self, msg_id: int, enabled: bool):
         """Handle message enable/disable."""
         if msg_id in self.message_states:
             self.message_states[msg_id].enabled = enabled
+            if self.sending and self._driver_timed:
+                if enabled:
+                    self._start_periodic_task(self.message_states[msg_id])
+                else:
+                    self._stop_periodic_task(msg_id)
+
+    def _on_log_tx_every_change(self):
+        """Handle TX log sampling change."""
+        try:
+            self._log_tx_every_n = max(1, int(self.log_tx_every_var.get()))
+        except ValueError:
+            pass
 
     def _on_interval_change(self, msg_id: int, interval_str: str):
         """Handle interval change."""
@@ -454,18 +687,47 @@ class CANEmulatorApp:
             interval = int(interval_str)
             if msg_id in self.message_states:
                 self.message_states[msg_id].interval_ms = interval
+                self._schedule_retime(msg_id)
         except ValueError:
             pass
 
+    def _schedule_retime(self, msg_id: int):
+        """Apply a new interval to a running cyclic task once the spinbox settles.
+
+        The send loop reads `interval_ms` each time it reschedules a message,
+        so only driver-timed tasks need this. python-can tasks cannot change
+        their period in place, so the task is restarted, debounced so that
+        spinning the interval does not flood the driver with stop/start
+        pairs.
+        """
+        if msg_id not in self._tasks:
+            return
+        job = self._retime_jobs.pop(msg_id, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        self._retime_jobs[msg_id] = self.root.after(
+            self.RETIME_DEBOUNCE_MS, lambda: self._retime_periodic_task(msg_id))
+
+    def _retime_periodic_task(self, msg_id: int):
+        """Restart a running cyclic task with the message's current interval."""
+        self._retime_jobs.pop(msg_id, None)
+        if msg_id not in self._tasks:
+            return
+        self._stop_periodic_task(msg_id)
+        self._start_periodic_task(self.message_states[msg_id])
+
     def _update_preview(self, msg_id: int):
         """Update the raw data preview for a message."""
         if msg_id not in self.message_states or msg_id not in self.message_widgets:
             return
 
         state = self.message_states[msg_id]
+        snapshot = tuple(state.values.values())
+        if snapshot == state.preview_values:
+            return
+        state.preview_values = snapshot
         data = state.message.build_data(state.values)
-        hex_str = ' '.join(f'{b:02X}' for b in data)
-        self.message_widgets[msg_id]['preview'].set(hex_str)
+        self.message_widgets[msg_id]['preview'].set(data.hex(' ').upper())
 
     def _update_sequence_listbox(self):
         """Update the sequence listbox."""
@@ -479,8 +741,6 @@ class CANEmulatorApp:
 
     def _on_protocol_change(self):
         """Handle protocol selection change."""
-        if self.sending:
-            self._stop_sending()
         self._load_protocol(self.protocol_var.get())
 
     def _apply_global_interval(self):
@@ -491,6 +751,7 @@ class CANEmulatorApp:
                 state.interval_ms = interval
                 if msg_id in self.message_widgets:
                     self.message_widgets[msg_id]['interval'].set(str(interval))
+                self._schedule_retime(msg_id)
         except ValueError:
             messagebox.showerror("Error", "Invalid interval value")
 
@@ -501,6 +762,7 @@ class CANEmulatorApp:
             idx = sel[0]
             self.send_sequence[idx], self.send_sequence[idx - 1] = \
                 self.send_sequence[idx - 1], self.send_sequence[idx]
+            self._publish_sequence()
             self._update_sequence_listbox()
             self.sequence_listbox.selection_set(idx - 1)
 
@@ -511,6 +773,7 @@ class CANEmulatorApp:
             idx = sel[0]
             self.send_sequence[idx], self.send_sequence[idx + 1] = \
                 self.send_sequence[idx + 1], self.send_sequence[idx]
+            self._publish_sequence()
             self._update_sequence_listbox()
             self.sequence_listbox.selection_set(idx + 1)
 
@@ -518,8 +781,17 @@ class CANEmulatorApp:
         """Reset sequence to default order."""
         messages = get_protocol_messages(self.current_protocol)
         self.send_sequence = [msg.id for msg in messages]
+        self._publish_sequence()
         self._update_sequence_listbox()
 
+    def _publish_sequence(self):
+        """Hand the current send order to the sender thread.
+
+        A running transmission re-ranks its schedule on the next wake-up,
+        so reordering takes effect without Stop/Start.
+        """
+        self._sequence_rank = {msg_id: i for i, msg_id in enumerate(self.send_sequence)}
+
     def _connect(self):
         """Connect to CAN bus."""
         if not CAN_AVAILABLE:
@@ -573,9 +845,28 @@ class CANEmulatorApp:
     def _start_sending(self):
         """Start cyclic message transmission."""
         if not self.can_bus:
-            messagebox.showwarning("Warning", "Not connected to CAN bus")
+            logger.warning("Not connected to CAN bus")
             return
 
+        if self.driver_timed_var.get():
+            self._start_periodic_tasks()
+            return
+
+        # Every message is scheduled (not only enabled ones) so that toggling
+        # "Enabled" while sending takes effect without restarting. The sequence
+        # position breaks ties between messages due at the same instant. The
+        # heap holds the states themselves, so the loop needs no id lookup.
+        self._publish_sequence()
+        rank = self._sequence_rank
+        now = time.monotonic_ns()
+        self._schedule = [
+            (now, rank[msg_id], msg_id, self.message_states[msg_id])
+            for msg_id in self.send_sequence
+            if msg_id in self.message_states
+        ]
+        heapq.heapify(self._schedule)
+
+        self._stop_event.clear()
         self.sending = True
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
@@ -587,91 +878,182 @@ class CANEmulatorApp:
     def _stop_sending(self):
         """Stop cyclic message transmission."""
         self.sending = False
+        self._driver_timed = False
+        self._stop_event.set()
         if self.send_thread:
             self.send_thread.join(timeout=1)
             self.send_thread = None
+        for msg_id in list(self._tasks):
+            self._stop_periodic_task(msg_id)
 
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         logger.info("Stopped cyclic transmission")
 
     def _send_loop(self):
-        """Background thread for cyclic message sending."""
-        last_send_times: Dict[int, float] = {msg_id: 0 for msg_id in self.send_sequence}
-
-        while self.sending:
-            now = time.time() * 1000  # Current time in ms
-
-            for msg_id in self.send_sequence:
-                if not self.sending:
-                    break
-
-                state = self.message_states.get(msg_id)
-                if not state or not state.enabled:
-                    continue
+        """Background thread for cyclic message sending.
+
+        Messages are kept in a min-heap keyed by their next deadline, so each
+        wake-up does O(log N) work for the one message that is actually due.
+        Deadlines advance by the interval from the scheduled time (not the
+        wake-up time), so jitter does not accumulate into drift.
+        """
+        schedule = self._schedule
+        rank = self._sequence_rank
+
+        while self.sending and schedule:
+            if self._sequence_rank is not rank:
+                # Sequence reordered while sending: re-rank, keep deadlines
+                rank = self._sequence_rank
+                schedule[:] = [(d, rank.get(msg_id, len(rank)), msg_id, s)
+                               for d, _, msg_id, s in schedule]
+                heapq.heapify(schedule)
+
+            deadline, _, msg_id, state = heapq.heappop(schedule)
+
+            delay = deadline - time.monotonic_ns()
+            if delay > 0 and self._stop_event.wait(delay / 1e9):
+                break
+
+            if state.enabled:
+                self._send_message(state)
 
-                # Check if it's time to send this message
-                if now - last_send_times[msg_id] >= state.interval_ms:
-                    self._send_message(state)
-                    last_send_times[msg_id] = now
+            next_deadline = deadline + state.interval_ms * 1_000_000
+            # If the next deadline has already passed (e.g. a stalled adapter),
+            # resync instead of bursting out the missed frames.
+            now = time.monotonic_ns()
+            if next_deadline < now:
+                next_deadline = now
+            heapq.heappush(schedule, (next_deadline, rank.get(msg_id, len(rank)), msg_id, state))
+
+    def _build_can_message(self, state: MessageState) -> "can.Message":
+        """Build the python-can frame for a message state."""
+        return can.Message(
+            arbitration_id=state.message.id,
+            data=state.message.build_data(state.values),
+            is_extended_id=False
+        )
 
-            # Small sleep to prevent CPU spinning
-            time.sleep(0.001)
+    def _send_message(self, state: MessageState, always_log: bool = False):
+        """Send a single CAN message.
 
-    def _send_message(self, state: MessageState):
-        """Send a single CAN message."""
+        Cyclic sends only log every Nth frame; `always_log` bypasses the sampling.
+        """
         if not self.can_bus:
             return
 
         try:
-            data = state.message.build_data(state.values)
-            msg = can.Message(
-                arbitration_id=state.message.id,
-                data=data,
-                is_extended_id=False
-            )
+            msg = state.msg_cache
+            if msg is None:
+                msg = state.msg_cache = can.Message(
+                    arbitration_id=state.message.id,
+                    data=bytearray(state.message.dlc),
+                    is_extended_id=False
+                )
+                state.dirty = True
+            if state.dirty:
+                # Clear before encoding so an edit racing with us re-marks it.
+                # Encode into a scratch buffer and swap it in with one
+                # assignment: the sender thread and Send Once share this
+                # frame, and neither may see a half-encoded payload.
+                state.dirty = False
+                data = bytearray(state.message.dlc)
+                state.message.build_data_into(state.values, data)
+                msg.data = data
+            # Snapshot what is sent; the log line is formatted after send()
+            data = bytes(msg.data)
             self.can_bus.send(msg)
 
-            self.messages_sent += 1
-            hex_data = ' '.join(f'{b:02X}' for b in data)
-            logger.info(f"TX 0x{state.message.id:03X} [{len(data)}] {hex_data}")
-
-            # Update stats in main thread
-            self.root.after(0, self._update_stats)
+            self.messages_sent = next(self._sent_counter)
+            self._tx_counter += 1
+            if always_log or self._tx_counter >= self._log_tx_every_n:
+                self._tx_counter = 0
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"TX 0x{state.message.id:03X} [{len(data)}] {data.hex(' ').upper()}")
 
         except Exception as e:
             logger.error(f"Send error: {e}")
 
+    def _start_periodic_tasks(self):
+        """Start driver-timed transmission: one send_periodic task per enabled message."""
+        self.sending = True
+        self._driver_timed = True
+        self.start_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.NORMAL)
+
+        for msg_id in self.send_sequence:
+            state = self.message_states.get(msg_id)
+            if state and state.enabled:
+                self._start_periodic_task(state)
+        logger.info(f"Started driver-timed transmission ({len(self._tasks)} tasks)")
+
+    def _start_periodic_task(self, state: MessageState):
+        """Hand one message to the interface's cyclic scheduler."""
+        if not self.can_bus or state.message.id in self._tasks:
+            return
+        try:
+            self._tasks[state.message.id] = self.can_bus.send_periodic(
+                self._build_can_message(state), state.interval_ms / 1000.0, store_task=False)
+        except Exception as e:
+            logger.error(f"send_periodic failed for 0x{state.message.id:03X}: {e}")
+
+    def _stop_periodic_task(self, msg_id: int):
+        """Stop and forget the cyclic task of a message, if any."""
+        task = self._tasks.pop(msg_id, None)
+        if task is None:
+            return
+        try:
+            task.stop()
+        except Exception as e:
+            logger.error(f"Failed to stop task 0x{msg_id:03X}: {e}")
+
+    def _update_periodic_task(self, msg_id: int):
+        """Push new payload bytes into a running cyclic task."""
+        task = self._tasks.get(msg_id)
+        if task is None:
+            return
+        state = self.message_states[msg_id]
+        if isinstance(task, can.ModifiableCyclicTaskABC):
+            try:
+                task.modify_data(self._build_can_message(state))
+                return
+            except Exception as e:
+                logger.error(f"modify_data failed for 0x{msg_id:03X}: {e}")
+        self._stop_periodic_task(msg_id)
+        self._start_periodic_task(state)
+
     def _send_once(self):
         """Send all enabled messages once."""
         if not self.can_bus:
-            messagebox.showwarning("Warning", "Not connected to CAN bus")
+            logger.warning("Not connected to CAN bus")
             return
 
         for msg_id in self.send_sequence:
             state = self.message_states.get(msg_id)
             if state and state.enabled:
-                self._send_message(state)
+                self._send_message(state, always_log=True)
+
+    def _schedule_stats(self):
+        """Refresh statistics periodically (10 Hz) from the Tk main loop."""
+        self._update_stats()
+        self.root.after(self.STATS_INTERVAL_MS, self._schedule_stats)
 
     def _update_stats(self):
         """Update statistics display."""
-        now = time.time()
-        if self.last_send_time > 0:
-            elapsed = now - self.last_send_time
-            if elapsed > 0:
-                rate = 1 / elapsed if elapsed < 1 else self.messages_sent / elapsed
-            else:
-                rate = 0
-        else:
-            rate = 0
+        now = time.monotonic()
+        sent = self.messages_sent
+        window = self._rate_window
+        window.append((now, sent))
+        old_time, old_sent = window[0]
+        rate = (sent - old_sent) / max(1e-9, now - old_time)
 
-        self.last_send_time = now
-        self.stats_var.set(f"Messages sent: {self.messages_sent}\nRate: {rate:.1f} msg/s")
+        self.stats_var.set(f"Messages sent: {sent}\nRate: {rate:.1f} msg/s")
 
     def _reset_stats(self):
         """Reset statistics."""
+        self._sent_counter = itertools.count(1)
         self.messages_sent = 0
-        self.last_send_time = 0
+        self._rate_window.clear()
         self.stats_var.set("Messages sent: 0\nRate: 0 msg/s")
 
     def _clear_log(self):
@@ -679,62 +1061,27 @@ class CANEmulatorApp:
         self.log_text.configure(state='normal')
         self.log_text.delete('1.0', tk.END)
         self.log_text.configure(state='disabled')
+        self._log_handler.reset()
 
     def _apply_preset(self, preset_name: str):
         """Apply a preset configuration."""
-        presets = {
-            "idle": {
-                "rpm": 800, "throttle": 0, "tps": 0, "coolant": 85,
-                "oil_pressure": 3.5, "brake": 0, "clutch": 0, "ignition": 1,
-                "rev_limiter": 0, "als_active": 0, "speed": 0, "gear": 0
-            },
-            "cruise": {
-                "rpm": 3000, "throttle": 25, "tps": 25, "coolant": 90,
-                "oil_pressure": 4.5, "brake": 0, "clutch": 0, "ignition": 1,
-                "rev_limiter": 0, "als_active": 0, "speed": 80, "gear": 4
-            },
-            "acceleration": {
-                "rpm": 5500, "throttle": 100, "tps": 100, "coolant": 95,
-                "oil_pressure": 5.0, "brake": 0, "clutch": 0, "ignition": 1,
-                "rev_limiter": 0, "als_active": 0, "speed": 120, "gear": 3
-            },
-            "rev_limiter": {
-                "rpm": 6500, "throttle": 100, "tps": 100, "coolant": 100,
-                "oil_pressure": 5.5, "brake": 0, "clutch": 0, "ignition": 1,
-                "rev_limiter": 1, "als_active": 0, "speed": 150, "gear": 4
-            },
-            "cold_start": {
-                "rpm": 1200, "throttle": 0, "tps": 0, "coolant": 20,
-                "oil_pressure": 4.0, "brake": 0, "clutch": 0, "ignition": 1,
-                "rev_limiter": 0, "als_active": 0, "speed": 0, "gear": 0
-            },
-            "oil_warning": {
-                "rpm": 4000, "throttle": 50, "tps": 50, "coolant": 95,
-                "oil_pressure": 0.5, "brake": 0, "clutch": 0, "ignition": 1,
-                "rev_limiter": 0, "als_active": 0, "speed": 100, "gear": 3
-            },
-        }
-
-        preset = presets.get(preset_name, {})
-        if not preset:
+        plan = self._preset_plans.get(preset_name)
+        if plan is None:
             return
 
-        for msg_id, state in self.message_states.items():
-            for field in state.message.fields:
-                if field.name in preset:
-                    value = preset[field.name]
-                    state.values[field.name] = value
-
-                    # Update GUI
-                    if msg_id in self.message_widgets:
-                        field_var = self.message_widgets[msg_id]['fields'].get(field.name)
-                        if field_var:
-                            if isinstance(field_var, tk.BooleanVar):
-                                field_var.set(bool(value))
-                            else:
-                                field_var.set(value)
-
+        # Only messages whose values actually moved need a preview/task refresh
+        changed = set()
+        for state, name, value, field_var, var_value in plan:
+            if state.values.get(name) == value:
+                continue
+            state.values[name] = value
+            state.dirty = True
+            field_var.set(var_value)
+            changed.add(state.message.id)
+
+        for msg_id in changed:
             self._update_preview(msg_id)
+            self._update_periodic_task(msg_id)
 
         logger.info(f"Applied preset: {preset_name}")
 
@@ -758,15 +1105,15 @@ class CANEmulatorApp:
         }
 
         for msg_id, state in self.message_states.items():
-            config["messages"][str(msg_id)] = {
-                "enabled": state.enabled,
-                "interval_ms": state.interval_ms,
-                "values": state.values
-            }
+            config["messages"][str(msg_id)] = state.to_dict()
 
         try:
-            with open(filename, 'w') as f:
-                json.dump(config, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(config, indent=2).encode('utf-8')
+            with open(filename, 'wb', buffering=1 << 16) as f:
+                f.write(payload)
             logger.info(f"Configuration saved to {filename}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save configuration: {e}")
@@ -800,6 +1147,7 @@ class CANEmulatorApp:
             # Load sequence
             if "sequence" in config:
                 self.send_sequence = config["sequence"]
+                self._publish_sequence()
                 self._update_sequence_listbox()
 
             # Load message settings
@@ -808,24 +1156,20 @@ class CANEmulatorApp:
                     msg_id = int(msg_id_str)
                     if msg_id in self.message_states:
                         state = self.message_states[msg_id]
-                        state.enabled = msg_config.get("enabled", True)
-                        state.interval_ms = msg_config.get("interval_ms", 100)
-                        state.values.update(msg_config.get("values", {}))
+                        state.update_from_dict(msg_config)
 
                         # Update GUI
                         if msg_id in self.message_widgets:
                             widgets = self.message_widgets[msg_id]
                             widgets['enabled'].set(state.enabled)
                             widgets['interval'].set(str(state.interval_ms))
+                            setters = widgets['setters']
                             for fname, fval in state.values.items():
-                                if fname in widgets['fields']:
-                                    var = widgets['fields'][fname]
-                                    if isinstance(var, tk.BooleanVar):
-                                        var.set(bool(fval))
-                                    else:
-                                        var.set(fval)
+                                setter = setters.get(fname)
+                                if setter is not None:
+                                    setter(fval)
 
-                        self._update_preview(msg_id)
+                        self._queue_preview(msg_id)
 
             logger.info(f"Configuration loaded from {filename}")
 
@@ -845,11 +1189,14 @@ class CANEmulatorApp:
 
         try:
             log_content = self.log_text.get('1.0', tk.END)
-            with open(filename, 'w') as f:
-                f.write(f"CAN Bus Emulator Log - {datetime.now()}\n")
-                f.write(f"Protocol: {self.current_protocol}\n")
-                f.write("-" * 60 + "\n")
-                f.write(log_content)
+            payload = (
+                f"CAN Bus Emulator Log - {datetime.now()}\n"
+                f"Protocol: {self.current_protocol}\n"
+                f"{'-' * 60}\n"
+                f"{log_content}"
+            )
+            with open(filename, 'w', buffering=1 << 16) as f:
+                f.write(payload)
             logger.info(f"Log exported to {filename}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export log: {e}")
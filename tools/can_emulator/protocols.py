@@ -4,11 +4,27 @@ Supports Custom Protocol, Link ECU Generic Dashboard, and Link ECU Generic Dashb
 """
 
 from dataclasses import dataclass, field
-from typing import List, Callable, Dict, Any, Optional
+from typing import List, Callable, Dict, Any, Optional, Tuple
 import struct
+import sys
 
 
-@dataclass
+# slots=True drops the per-instance __dict__ (smaller objects, faster
+# attribute reads on the encode path); it needs Python 3.10+.
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# (signed, byte_length) -> little-endian packer and clamp range
+_PACKERS = {
+    (False, 1): (struct.Struct('<B'), 0, 0xFF),
+    (False, 2): (struct.Struct('<H'), 0, 0xFFFF),
+    (False, 4): (struct.Struct('<I'), 0, 0xFFFFFFFF),
+    (True, 1): (struct.Struct('<b'), -0x80, 0x7F),
+    (True, 2): (struct.Struct('<h'), -0x8000, 0x7FFF),
+    (True, 4): (struct.Struct('<i'), -0x80000000, 0x7FFFFFFF),
+}
+
+
+@dataclass(**_SLOTS)
 class MessageField:
     """Represents a single field within a CAN message."""
     name: str
@@ -22,335 +38,421 @@ class MessageField:
     scale: float = 1.0  # Value is multiplied by this before encoding
     signed: bool = False
     bit_position: Optional[int] = None  # For bit flags: which bit within the byte(s)
+    # Derived in __post_init__
+    _packer: Optional[struct.Struct] = field(default=None, init=False, repr=False, compare=False)
+    _lo: int = field(default=0, init=False, repr=False, compare=False)
+    _hi: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Resolve the packer once instead of branching on every encode
+        self._packer, self._lo, self._hi = _PACKERS.get(
+            (self.signed, self.byte_length), (None, 0, 0))
 
     def encode(self, value: float) -> bytes:
         """Encode a value to bytes."""
-        scaled = int(value * self.scale)
-        if self.signed:
-            if self.byte_length == 1:
-                return struct.pack('<b', max(-128, min(127, scaled)))
-            elif self.byte_length == 2:
-                return struct.pack('<h', max(-32768, min(32767, scaled)))
-            elif self.byte_length == 4:
-                return struct.pack('<i', scaled)
-        else:
-            if self.byte_length == 1:
-                return struct.pack('<B', max(0, min(255, scaled)))
-            elif self.byte_length == 2:
-                return struct.pack('<H', max(0, min(65535, scaled)))
-            elif self.byte_length == 4:
-                return struct.pack('<I', max(0, min(0xFFFFFFFF, scaled)))
-        return b'\x00' * self.byte_length
+        if self._packer is None:
+            return b'\x00' * self.byte_length
+        return self._packer.pack(max(self._lo, min(self._hi, int(value * self.scale))))
+
+    def encode_into(self, buf: bytearray, offset: int, value: float) -> None:
+        """Encode a value straight into `buf` at `offset`, without a temporary bytes object."""
+        if self._packer is None:
+            buf[offset:offset + self.byte_length] = bytes(self.byte_length)
+            return
+        self._packer.pack_into(buf, offset, max(self._lo, min(self._hi, int(value * self.scale))))
 
     def is_bit_flag(self) -> bool:
         """Check if this field is a single bit flag."""
         return self.bit_position is not None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CANMessage:
     """Represents a CAN message with its fields."""
     id: int
     name: str
     description: str
     dlc: int  # Data Length Code (1-8 bytes)
-    fields: List[MessageField]
+    fields: Tuple[MessageField, ...]
     enabled: bool = True
     interval_ms: int = 100  # Default sending interval
+    # Packing plan, derived by compile_plan()
+    _value_plan: tuple = field(default=(), init=False, repr=False, compare=False)
+    _partial_plan: tuple = field(default=(), init=False, repr=False, compare=False)
+    _bit_groups: tuple = field(default=(), init=False, repr=False, compare=False)
+    _combined: Optional[struct.Struct] = field(default=None, init=False, repr=False, compare=False)
+    _combined_plan: tuple = field(default=(), init=False, repr=False, compare=False)
+
+    def default_values(self) -> Dict[str, float]:
+        """Return a values dict holding every field's default."""
+        return {f.name: f.default_value for f in self.fields}
 
     def build_data(self, values: Dict[str, float]) -> bytes:
-        """Build the CAN data payload from field values."""
+        """Build the CAN data payload from field values.
+
+        `values` must hold every field name (start from default_values()).
+        Must keep returning bytes (or bytearray): the GUI formats payloads
+        with data.hex(' ').
+        """
         data = bytearray(self.dlc)
+        self.build_data_into(values, data)
+        return bytes(data)
 
-        # First pass: handle non-bit fields
-        for f in self.fields:
-            if f.is_bit_flag():
-                continue
-            val = values.get(f.name, f.default_value)
-            encoded = f.encode(val)
-            for i, b in enumerate(encoded):
-                if f.byte_offset + i < self.dlc:
-                    data[f.byte_offset + i] = b
-
-        # Second pass: handle bit fields (OR them together)
+    def __post_init__(self):
+        self.compile_plan()
+
+    def compile_plan(self) -> None:
+        """Precompute the packing plan used by build_data_into().
+
+        Splits the fields once into value fields and bit flags, and into
+        value fields that fit inside the DLC (packed in place) and those cut
+        off by it (encoded, then truncated), so encoding does no per-field
+        type checks or per-byte bounds checks.
+        """
+        values = [f for f in self.fields if not f.is_bit_flag() and f.byte_offset < self.dlc]
+        self._value_plan = tuple(
+            f for f in values if f.byte_offset + f.byte_length <= self.dlc
+        )
+        self._partial_plan = tuple(
+            (f, self.dlc - f.byte_offset)
+            for f in values if f.byte_offset + f.byte_length > self.dlc
+        )
+        # Bit flags inside the DLC grouped per byte:
+        # ((byte offset, ((name, mask), ...)), ...)
+        groups: Dict[int, list] = {}
         for f in self.fields:
-            if not f.is_bit_flag():
-                continue
-            val = values.get(f.name, f.default_value)
-            if val:
-                if f.byte_offset < self.dlc:
-                    data[f.byte_offset] |= (1 << f.bit_position)
+            if f.is_bit_flag() and f.byte_offset < self.dlc:
+                groups.setdefault(f.byte_offset, []).append(
+                    (sys.intern(f.name), 1 << f.bit_position))
+        self._bit_groups = tuple((off, tuple(bits)) for off, bits in groups.items())
+        self._combined = self._compile_combined()
 
-        return bytes(data)
+    def _compile_combined(self) -> Optional[struct.Struct]:
+        """Build one Struct covering the whole payload, if the layout allows it.
+
+        Possible when every value field fits inside the DLC with a known
+        packer and no two value fields overlap; gaps become pad bytes. The
+        Struct zero-fills the DLC as it packs, so bit flags can still be
+        OR-ed on top afterwards.
+        """
+        if self._partial_plan:
+            return None
+        fmt = '<'
+        pos = 0
+        ordered = sorted(self._value_plan, key=lambda f: f.byte_offset)
+        for f in ordered:
+            if f._packer is None or f.byte_offset < pos:
+                return None
+            fmt += 'x' * (f.byte_offset - pos) + f._packer.format[1:]
+            pos = f.byte_offset + f.byte_length
+        fmt += 'x' * (self.dlc - pos)
+        # Plain tuples with interned names: cheaper to unpack in the hot loop
+        # than attribute reads on the field dataclasses
+        self._combined_plan = tuple(
+            (sys.intern(f.name), f.scale, f._lo, f._hi)
+            for f in ordered
+        )
+        return struct.Struct(fmt)
+
+    def build_data_into(self, values: Dict[str, float], out: bytearray) -> None:
+        """Encode field values into a caller-owned buffer of at least `dlc` bytes.
+
+        Like build_data(), expects `values` to hold every field name, so the
+        loops below index it directly instead of falling back to defaults.
+        """
+        if self._combined is not None:
+            # Single C-level pack of the whole payload
+            self._combined.pack_into(out, 0, *[
+                max(lo, min(hi, int(values[name] * scale)))
+                for name, scale, lo, hi in self._combined_plan
+            ])
+        else:
+            out[:self.dlc] = bytes(self.dlc)
+            for f in self._value_plan:
+                f.encode_into(out, f.byte_offset, values[f.name])
+            for f, n in self._partial_plan:
+                off = f.byte_offset
+                out[off:off + n] = f.encode(values[f.name])[:n]
+
+        # Bit flags are accumulated per byte and OR-ed on top of the value fields
+        for off, bits in self._bit_groups:
+            acc = 0
+            for name, mask in bits:
+                if values[name]:
+                    acc |= mask
+            if acc:
+                out[off] |= acc
 
 
 # ============== Custom Protocol (CAN_PROTOCOL = 0) ==============
-CUSTOM_PROTOCOL_MESSAGES = [
+CUSTOM_PROTOCOL_MESSAGES = (
     CANMessage(
         id=0x100,
         name="Throttle",
         description="Throttle pedal position",
         dlc=1,
-        fields=[
+        fields=(
             MessageField("throttle", "Throttle %", 0, 100, 0, "%", 0, 1),
-        ]
+        )
     ),
     CANMessage(
         id=0x101,
         name="Pedals",
         description="Brake, Handbrake, Clutch positions",
         dlc=3,
-        fields=[
+        fields=(
             MessageField("brake", "Brake %", 0, 100, 0, "%", 0, 1),
             MessageField("handbrake", "Handbrake %", 0, 100, 0, "%", 1, 1),
             MessageField("clutch", "Clutch %", 0, 100, 0, "%", 2, 1),
-        ]
+        )
     ),
     CANMessage(
         id=0x102,
         name="RPM",
         description="Engine RPM",
         dlc=2,
-        fields=[
+        fields=(
             MessageField("rpm", "Engine RPM", 0, 10000, 800, "rpm", 0, 2),
-        ]
+        )
     ),
     CANMessage(
         id=0x103,
         name="Coolant",
         description="Coolant temperature",
         dlc=2,
-        fields=[
+        fields=(
             MessageField("coolant", "Coolant Temp", 0, 150, 85, "C", 0, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x104,
         name="Oil Pressure",
         description="Oil pressure",
         dlc=2,
-        fields=[
+        fields=(
             MessageField("oil_pressure", "Oil Pressure", 0, 10, 4.0, "bar", 0, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x105,
         name="Flags",
         description="Rev limiter and ALS flags",
         dlc=1,
-        fields=[
+        fields=(
             MessageField("rev_limiter", "Rev Limiter Active", 0, 1, 0, "", 0, 1, bit_position=0),
             MessageField("als_active", "ALS Active", 0, 1, 0, "", 0, 1, bit_position=1),
-        ]
+        )
     ),
     CANMessage(
         id=0x106,
         name="Ignition",
         description="Ignition state",
         dlc=1,
-        fields=[
+        fields=(
             MessageField("ignition", "Ignition On", 0, 1, 1, "", 0, 1),
-        ]
+        )
     ),
-]
+)
 
 
 # ============== Link ECU Generic Dashboard (CAN_PROTOCOL = 1) ==============
-LINK_GENERIC_MESSAGES = [
+LINK_GENERIC_MESSAGES = (
     CANMessage(
         id=0x5F0,
         name="RPM & TPS",
         description="Engine RPM and Throttle Position",
         dlc=6,
-        fields=[
+        fields=(
             MessageField("rpm", "Engine RPM", 0, 15000, 800, "rpm", 0, 4),
             MessageField("tps", "Throttle Position", 0, 100, 0, "%", 4, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F1,
         name="Fuel & Ignition",
         description="Fuel pressure and Ignition timing",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("fuel_pressure", "Fuel Pressure", 0, 10, 3.0, "bar", 0, 2, scale=10),
             MessageField("ign_timing", "Ignition Timing", -20, 60, 15, "deg", 2, 2, scale=10, signed=True),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F2,
         name="Pressures",
         description="MAP, Baro, Lambda",
         dlc=6,
-        fields=[
+        fields=(
             MessageField("map", "MAP", 0, 300, 100, "kPa", 0, 2, scale=10),
             MessageField("baro", "Barometric", 90, 110, 101, "kPa", 2, 2, scale=10),
             MessageField("lambda", "Lambda", 0.5, 1.5, 1.0, "", 4, 2, scale=100),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F3,
         name="Temperatures",
         description="Coolant and Air temperatures",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("coolant", "Coolant Temp", -40, 150, 85, "C", 0, 2, scale=10),
             MessageField("air_temp", "Air Temp", -40, 80, 25, "C", 2, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F4,
         name="Voltage & Flags",
         description="Battery voltage and status flags",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("battery", "Battery Voltage", 8, 18, 14.0, "V", 0, 2, scale=100),
             MessageField("rev_limiter", "Rev Limiter", 0, 1, 0, "", 2, 1, bit_position=0),
             MessageField("launch_control", "Launch Control", 0, 1, 0, "", 2, 1, bit_position=1),
             MessageField("flat_shift", "Flat Shift", 0, 1, 0, "", 2, 1, bit_position=2),
             MessageField("ignition", "Ignition On", 0, 1, 1, "", 2, 1, bit_position=7),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F5,
         name="Gear & Oil",
         description="Gear position and Oil pressure",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("gear", "Gear", 0, 8, 0, "", 0, 1),
             MessageField("oil_pressure", "Oil Pressure", 0, 10, 4.0, "bar", 2, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F6,
         name="Vehicle Speed",
         description="Vehicle speed",
         dlc=2,
-        fields=[
+        fields=(
             MessageField("speed", "Vehicle Speed", 0, 300, 0, "km/h", 0, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x5F7,
         name="Throttle Sensors",
         description="Throttle position sensors",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("tps1", "TPS 1", 0, 100, 0, "%", 0, 2, scale=10),
             MessageField("tps2", "TPS 2", 0, 100, 0, "%", 2, 2, scale=10),
-        ]
+        )
     ),
-]
+)
 
 
 # ============== Link ECU Generic Dashboard 2 (CAN_PROTOCOL = 2) ==============
-LINK_GENERIC2_MESSAGES = [
+LINK_GENERIC2_MESSAGES = (
     CANMessage(
         id=0x2000,
         name="Engine Data 1",
         description="RPM, TPS, ECT, IAT",
         dlc=8,
-        fields=[
+        fields=(
             MessageField("rpm", "Engine RPM", 0, 15000, 800, "rpm", 0, 2),
             MessageField("tps", "Throttle Position", 0, 100, 0, "%", 2, 2, scale=10),
             MessageField("coolant", "Coolant Temp", -40, 150, 85, "C", 4, 2, scale=10),
             MessageField("air_temp", "Air Temp", -40, 80, 25, "C", 6, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x2001,
         name="Engine Data 2",
         description="MAP, Battery, Fuel Pressure, Oil Pressure",
         dlc=8,
-        fields=[
+        fields=(
             MessageField("map", "MAP", 0, 300, 100, "kPa", 0, 2, scale=10),
             MessageField("battery", "Battery Voltage", 8, 18, 14.0, "V", 2, 2, scale=100),
             MessageField("fuel_pressure", "Fuel Pressure", 0, 10, 3.0, "bar", 4, 2, scale=10),
             MessageField("oil_pressure", "Oil Pressure", 0, 10, 4.0, "bar", 6, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x2002,
         name="Engine Data 3",
         description="Lambda, Ignition timing, Fuel level",
         dlc=6,
-        fields=[
+        fields=(
             MessageField("lambda", "Lambda", 0.5, 1.5, 1.0, "", 0, 2, scale=100),
             MessageField("ign_timing", "Ignition Timing", -20, 60, 15, "deg", 2, 2, scale=10, signed=True),
             MessageField("fuel_level", "Fuel Level", 0, 100, 50, "%", 4, 2),
-        ]
+        )
     ),
     CANMessage(
         id=0x2003,
         name="Engine Data 4",
         description="Boost control, Idle control",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("boost_duty", "Boost Duty", 0, 100, 0, "%", 0, 2, scale=10),
             MessageField("idle_duty", "Idle Valve", 0, 100, 30, "%", 2, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x2004,
         name="Vehicle Data 1",
         description="Speed, Gear, Launch/Flat shift status",
         dlc=4,
-        fields=[
+        fields=(
             MessageField("speed", "Vehicle Speed", 0, 300, 0, "km/h", 0, 2, scale=10),
             MessageField("gear", "Gear", 0, 8, 0, "", 2, 1),
             MessageField("launch_control", "Launch Control", 0, 1, 0, "", 3, 1, bit_position=0),
             MessageField("flat_shift", "Flat Shift", 0, 1, 0, "", 3, 1, bit_position=1),
-        ]
+        )
     ),
     CANMessage(
         id=0x2005,
         name="Vehicle Data 2",
         description="Wheel speeds",
         dlc=8,
-        fields=[
+        fields=(
             MessageField("wheel_fl", "Wheel FL", 0, 300, 0, "km/h", 0, 2, scale=10),
             MessageField("wheel_fr", "Wheel FR", 0, 300, 0, "km/h", 2, 2, scale=10),
             MessageField("wheel_rl", "Wheel RL", 0, 300, 0, "km/h", 4, 2, scale=10),
             MessageField("wheel_rr", "Wheel RR", 0, 300, 0, "km/h", 6, 2, scale=10),
-        ]
+        )
     ),
     CANMessage(
         id=0x2006,
         name="Flags & Warnings",
         description="Engine protection flags, warnings",
         dlc=2,
-        fields=[
+        fields=(
             MessageField("rev_limiter", "Rev Limiter", 0, 1, 0, "", 0, 1, bit_position=0),
             MessageField("ignition", "Ignition On", 0, 1, 1, "", 0, 1, bit_position=7),
             MessageField("engine_protection", "Engine Protection", 0, 1, 0, "", 1, 1),
-        ]
+        )
     ),
     CANMessage(
         id=0x2007,
         name="Analog Inputs",
         description="User-configurable analog inputs",
         dlc=8,
-        fields=[
+        fields=(
             MessageField("an1", "Analog 1", 0, 5, 0, "V", 0, 2, scale=1000),
             MessageField("an2", "Analog 2", 0, 5, 0, "V", 2, 2, scale=1000),
             MessageField("an3", "Analog 3", 0, 5, 0, "V", 4, 2, scale=1000),
             MessageField("an4", "Analog 4", 0, 5, 0, "V", 6, 2, scale=1000),
-        ]
+        )
     ),
-]
+)
 
 
 # Protocol registry
-PROTOCOLS = {
+# Protocols are read-only after import: the message tables are tuples whose
+# packing plans are compiled at construction, and callers share them as-is.
+PROTOCOLS: Dict[str, Tuple[CANMessage, ...]] = {
     "Custom Protocol": CUSTOM_PROTOCOL_MESSAGES,
     "Link ECU Generic Dashboard": LINK_GENERIC_MESSAGES,
     "Link ECU Generic Dashboard 2": LINK_GENERIC2_MESSAGES,
 }
 
 
-def get_protocol_messages(protocol_name: str) -> List[CANMessage]:
-    """Get messages for a specific protocol."""
-    return PROTOCOLS.get(protocol_name, [])
+def get_protocol_messages(protocol_name: str) -> Tuple[CANMessage, ...]:
+    """Get messages for a specific protocol (shared, do not modify)."""
+    return PROTOCOLS.get(protocol_name, ())
 
 
 def get_protocol_names() -> List[str]:
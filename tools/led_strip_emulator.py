@@ -21,6 +21,26 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
+import struct
+
+
+# Two-digit hex for every byte value, so colors are built by concatenation
+HEX2 = tuple(f'{v:02x}' for v in range(256))
+
+
+def parse_led_frame(line):
+    """Return the hex payload of an "LED:<count>:<hex>" line.
+
+    The payload is trimmed to whole LEDs; raises ValueError on a malformed
+    line.
+    """
+    # Fixed layout: slice at the second colon instead of splitting the line
+    sep = line.find(':', 4)
+    if sep == -1:
+        raise ValueError("missing LED data")
+    int(line[4:sep])  # LED count, validated only
+    hex_data = line[sep + 1:]
+    return hex_data[:len(hex_data) - len(hex_data) % 6]
 
 
 class LEDStripVisualizer(tk.Canvas):
@@ -39,6 +59,11 @@ class LEDStripVisualizer(tk.Canvas):
         super().__init__(parent, width=width, height=height, bg='#1a1a1a', **kwargs)
 
         self.led_colors = [(0, 0, 0)] * led_count
+        # Color last sent to Tk per LED; only LEDs that differ get an itemconfig
+        self._shown_colors = [(0, 0, 0)] * led_count
+        # (r, g, b) -> (fill, outline); strips reuse a small palette, so a
+        # changed LED usually finds its strings here
+        self._style_cache = {}
         self.led_items = []
         self.label_items = []
 
@@ -74,20 +99,38 @@ class LEDStripVisualizer(tk.Canvas):
     def set_led_colors(self, colors):
         """Update LED colors from list of (r, g, b) tuples"""
         self.led_colors = colors[:self.led_count]
+        # Hot loop: bind everything it touches to locals once
+        shown = self._shown_colors
+        items = self.led_items
+        call = self.tk.call
+        w = self._w
+        hx = HEX2
+        styles = self._style_cache
+        if len(styles) > 4096:
+            styles.clear()
+
+        for i, rgb in enumerate(self.led_colors):
+            if rgb == shown[i]:
+                continue
+            shown[i] = rgb
+
+            style = styles.get(rgb)
+            if style is None:
+                r, g, b = rgb
 
-        for i, (r, g, b) in enumerate(self.led_colors):
-            if i < len(self.led_items):
                 # Convert RGB to hex color
-                color = f'#{r:02x}{g:02x}{b:02x}'
+                color = '#' + hx[r] + hx[g] + hx[b]
 
                 # Calculate brightness for outline glow effect
-                brightness = max(r, g, b)
-                if brightness > 50:
-                    outline = f'#{min(255, r + 50):02x}{min(255, g + 50):02x}{min(255, b + 50):02x}'
+                if max(r, g, b) > 50:
+                    outline = '#' + hx[min(255, r + 50)] + hx[min(255, g + 50)] + hx[min(255, b + 50)]
                 else:
                     outline = '#333333'
+                style = styles[rgb] = (color, outline)
+            color, outline = style
 
-                self.itemconfig(self.led_items[i], fill=color, outline=outline)
+            # Raw Tcl call: skips Canvas.itemconfig's Python option processing
+            call(w, 'itemconfigure', items[i], '-fill', color, '-outline', outline)
 
     def clear(self):
         """Turn off all LEDs"""
@@ -97,49 +140,39 @@ class LEDStripVisualizer(tk.Canvas):
 class CANMessageBuilder:
     """Builds CAN messages for Link ECU Generic Dashboard protocol"""
 
+    # Precompiled 8-byte little-endian layouts; 'x' pads are packed as zero
+    _LINK_5F0 = struct.Struct('<IH2x')   # RPM (u32) + TPS*10 (u16)
+    _LINK_5F3 = struct.Struct('<HH4x')   # Coolant*10 (u16) + AirTemp*10 (u16)
+    _LINK_5F4 = struct.Struct('<HB5x')   # Battery*100 (u16) + Flags
+    _LINK_5F5 = struct.Struct('<BxH4x')  # Gear + pad + OilPressure*100 (u16)
+    _LINK_5F6 = struct.Struct('<H6x')    # Speed*10 (u16)
+
+    GEAR_CODES = {"N": 0, "1": 1, "2": 2, "3": 3, "4": 4, "5": 5, "6": 6}
+
     @staticmethod
     def build_link_generic_messages(rpm, tps, coolant, oil_pressure, speed, gear, ignition):
         """Build Link Generic Dashboard protocol messages"""
-        messages = []
-
-        # 0x5F0: RPM (u32 LE) + TPS*10 (u16 LE)
-        rpm_bytes = rpm.to_bytes(4, 'little')
-        tps_bytes = int(tps * 10).to_bytes(2, 'little')
-        data = rpm_bytes + tps_bytes + bytes([0, 0])
-        messages.append((0x5F0, 8, data))
-
-        # 0x5F3: Coolant*10 (u16) + AirTemp*10 (u16)
-        coolant_bytes = int(coolant * 10).to_bytes(2, 'little')
-        airtemp_bytes = int(25 * 10).to_bytes(2, 'little')  # Fixed air temp
-        data = coolant_bytes + airtemp_bytes + bytes([0, 0, 0, 0])
-        messages.append((0x5F3, 8, data))
-
-        # 0x5F4: Battery*100 (u16) + Flags
-        battery_bytes = int(14.0 * 100).to_bytes(2, 'little')
+        b = CANMessageBuilder
         flags = 0x80 if ignition else 0x00  # Bit 7 = ignition
-        data = battery_bytes + bytes([flags, 0, 0, 0, 0, 0])
-        messages.append((0x5F4, 8, data))
-
-        # 0x5F5: Gear + pad + OilPressure*100 (u16)
-        oil_bytes = int(oil_pressure * 100).to_bytes(2, 'little')
-        data = bytes([gear, 0]) + oil_bytes + bytes([0, 0, 0, 0])
-        messages.append((0x5F5, 8, data))
-
-        # 0x5F6: Speed*10 (u16)
-        speed_bytes = int(speed * 10).to_bytes(2, 'little')
-        data = speed_bytes + bytes([0, 0, 0, 0, 0, 0])
-        messages.append((0x5F6, 8, data))
-
-        return messages
+        return [
+            (0x5F0, 8, b._LINK_5F0.pack(rpm, int(tps * 10))),
+            (0x5F3, 8, b._LINK_5F3.pack(int(coolant * 10), 25 * 10)),  # Fixed air temp
+            (0x5F4, 8, b._LINK_5F4.pack(int(14.0 * 100), flags)),
+            (0x5F5, 8, b._LINK_5F5.pack(gear, int(oil_pressure * 100))),
+            (0x5F6, 8, b._LINK_5F6.pack(int(speed * 10))),
+        ]
 
     @staticmethod
     def format_serial_command(can_id, dlc, data):
         """Format CAN message for serial protocol"""
-        hex_data = ''.join(f'{b:02X}' for b in data[:dlc])
+        hex_data = bytes(data[:dlc]).hex().upper()
         return f"CAN:{can_id:03X}:{dlc}:{hex_data}"
 
 
 class LEDStripEmulator:
+    # Cyclic mode only resends changed frames; every Nth cycle sends all of them
+    FULL_REFRESH_CYCLES = 10
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("LED Strip Emulator")
@@ -150,8 +183,13 @@ class LEDStripEmulator:
         self.ser = None
         self.running = False
         self.read_thread = None
-        self.send_thread = None
         self.cyclic_running = False
+        self._cyclic_after_id = None
+        self._cyclic_deadline = 0.0
+        self._tx_cycle = 0
+        self._last_tx = {}
+        self._pending_labels = {}
+        self._labels_job = None
 
         self.frame_count = 0
         self.last_fps_time = time.time()
@@ -237,7 +275,7 @@ class LEDStripEmulator:
         self.rpm_scale.pack(side='left', padx=5)
         self.rpm_label = ttk.Label(rpm_row, text="800", width=6)
         self.rpm_label.pack(side='left')
-        self.rpm_var.trace_add('write', lambda *_: self.rpm_label.config(text=str(self.rpm_var.get())))
+        self.rpm_var.trace_add('write', lambda *_: self._schedule_label(self.rpm_label, self.rpm_var, str))
 
         # Throttle slider
         tps_row = ttk.Frame(sim_frame)
@@ -249,7 +287,7 @@ class LEDStripEmulator:
         self.tps_scale.pack(side='left', padx=5)
         self.tps_label = ttk.Label(tps_row, text="0", width=6)
         self.tps_label.pack(side='left')
-        self.tps_var.trace_add('write', lambda *_: self.tps_label.config(text=str(self.tps_var.get())))
+        self.tps_var.trace_add('write', lambda *_: self._schedule_label(self.tps_label, self.tps_var, str))
 
         # Brake slider
         brake_row = ttk.Frame(sim_frame)
@@ -261,7 +299,7 @@ class LEDStripEmulator:
         self.brake_scale.pack(side='left', padx=5)
         self.brake_label = ttk.Label(brake_row, text="0", width=6)
         self.brake_label.pack(side='left')
-        self.brake_var.trace_add('write', lambda *_: self.brake_label.config(text=str(self.brake_var.get())))
+        self.brake_var.trace_add('write', lambda *_: self._schedule_label(self.brake_label, self.brake_var, str))
 
         # Coolant slider
         coolant_row = ttk.Frame(sim_frame)
@@ -273,7 +311,7 @@ class LEDStripEmulator:
         self.coolant_scale.pack(side='left', padx=5)
         self.coolant_label = ttk.Label(coolant_row, text="85", width=6)
         self.coolant_label.pack(side='left')
-        self.coolant_var.trace_add('write', lambda *_: self.coolant_label.config(text=str(self.coolant_var.get())))
+        self.coolant_var.trace_add('write', lambda *_: self._schedule_label(self.coolant_label, self.coolant_var, str))
 
         # Oil pressure slider
         oil_row = ttk.Frame(sim_frame)
@@ -285,7 +323,7 @@ class LEDStripEmulator:
         self.oil_scale.pack(side='left', padx=5)
         self.oil_label = ttk.Label(oil_row, text="4.5", width=6)
         self.oil_label.pack(side='left')
-        self.oil_var.trace_add('write', lambda *_: self.oil_label.config(text=f"{self.oil_var.get():.1f}"))
+        self.oil_var.trace_add('write', lambda *_: self._schedule_label(self.oil_label, self.oil_var, '{:.1f}'.format))
 
         # Checkboxes row
         check_row = ttk.Frame(sim_frame)
@@ -373,6 +411,9 @@ class LEDStripEmulator:
         self.log_text.tag_config('error', foreground='#ff6666')
 
         self.log_line_count = 0
+        # Lines waiting for the next batched insert into the log widget
+        self._log_pending = []
+        self._log_flush_scheduled = False
 
     def refresh_ports(self):
         ports = serial.tools.list_ports.comports()
@@ -381,6 +422,20 @@ class LEDStripEmulator:
         if port_list:
             self.port_combo.current(0)
 
+    def _schedule_label(self, label, var, fmt):
+        """Queue a value label refresh; slider drags write the variable far
+        more often than the label needs redrawing."""
+        self._pending_labels[label] = (var, fmt)
+        if self._labels_job is None:
+            self._labels_job = self.root.after_idle(self._flush_labels)
+
+    def _flush_labels(self):
+        self._labels_job = None
+        pending = self._pending_labels
+        self._pending_labels = {}
+        for label, (var, fmt) in pending.items():
+            label.config(text=fmt(var.get()))
+
     def toggle_connection(self):
         if self.ser and self.ser.is_open:
             self.disconnect()
@@ -395,8 +450,13 @@ class LEDStripEmulator:
 
         port = selection.split(' - ')[0]
         try:
-            self.ser = serial.Serial(port, 115200, timeout=0.1)
+            # The read timeout paces read_loop when the line is idle
+            self.ser = serial.Serial(port, 115200, timeout=0.05)
+            if hasattr(self.ser, 'set_buffer_size'):
+                # Windows only: the default driver queues are 4 KiB
+                self.ser.set_buffer_size(rx_size=65536, tx_size=65536)
             self.running = True
+            self._last_tx.clear()
             self.read_thread = threading.Thread(target=self.read_loop, daemon=True)
             self.read_thread.start()
 
@@ -409,12 +469,10 @@ class LEDStripEmulator:
 
     def disconnect(self):
         self.running = False
-        self.cyclic_running = False
+        self._stop_cyclic()
 
         if self.read_thread:
             self.read_thread.join(timeout=1)
-        if self.send_thread:
-            self.send_thread.join(timeout=1)
 
         if self.ser:
             self.ser.close()
@@ -429,88 +487,126 @@ class LEDStripEmulator:
     def read_loop(self):
         """Background thread that reads serial data"""
         buffer = ""
+        ser = self.ser
+        last_hex = None
         while self.running:
             try:
-                if self.ser and self.ser.is_open and self.ser.in_waiting:
-                    data = self.ser.read(self.ser.in_waiting).decode('utf-8', errors='ignore')
-                    buffer += data
-
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
-                        if line:
-                            self.root.after(0, lambda l=line: self.process_line(l))
-                else:
-                    time.sleep(0.01)
+                # Block in the driver (up to the port timeout) for the first
+                # byte instead of polling, then drain whatever else arrived
+                chunk = ser.read(ser.in_waiting or 1)
+                if not chunk:
+                    continue
+                waiting = ser.in_waiting
+                if waiting:
+                    chunk += ser.read(waiting)
+                buffer += chunk.decode('utf-8', errors='ignore')
+
+                # Hand every complete line of this read to Tk in one callback
+                *lines, buffer = buffer.split('\n')
+                lines = [l.strip() for l in lines if l.strip()]
+                if not lines:
+                    continue
+
+                # Decode the newest valid LED frame here so the Tk thread only
+                # draws. Colors are None when the payload repeats the last frame.
+                frame = None
+                error = None
+                for line in reversed(lines):
+                    if line.startswith("LED:"):
+                        try:
+                            hex_data = parse_led_frame(line)
+                            colors = None
+                            if hex_data != last_hex:
+                                colors = list(struct.iter_unpack('3B', bytes.fromhex(hex_data)))
+                                last_hex = hex_data
+                            frame = (hex_data, colors)
+                            break
+                        except ValueError as e:
+                            error = error or e
+
+                self.root.after(0, self.process_lines, lines, frame, error)
             except Exception as e:
-                self.root.after(0, lambda: self.log_message(f"Read error: {e}", 'error'))
+                self.root.after(0, self.log_message, f"Read error: {e}", 'error')
                 time.sleep(0.1)
 
-    def process_line(self, line):
-        """Process received line from serial"""
-        if line.startswith("LED:"):
-            self.process_led_data(line)
-            if self.show_led_var.get():
-                self.log_message(f"RX: {line[:80]}...", 'led')
-        else:
-            self.log_message(f"RX: {line}", 'rx')
-
-    def process_led_data(self, line):
-        """Parse LED data and update visualization"""
-        try:
-            parts = line.split(':')
-            if len(parts) >= 3:
-                led_count = int(parts[1])
-                hex_data = parts[2]
-
-                colors = []
-                for i in range(0, len(hex_data), 6):
-                    if i + 6 <= len(hex_data):
-                        r = int(hex_data[i:i+2], 16)
-                        g = int(hex_data[i+2:i+4], 16)
-                        b = int(hex_data[i+4:i+6], 16)
-                        colors.append((r, g, b))
-
-                self.led_strip.set_led_colors(colors)
-
-                # Update stats
-                self.frame_count += 1
-                self.frame_label.config(text=f"Frames: {self.frame_count}")
-
-                now = time.time()
-                if now - self.last_fps_time >= 1.0:
-                    self.fps = self.frame_count / (now - self.last_fps_time)
-                    self.frame_count = 0
-                    self.last_fps_time = now
-                    self.fps_label.config(text=f"FPS: {self.fps:.1f}")
-
-                self.data_label.config(text=f"LEDs: {len(colors)}")
-
-        except Exception as e:
-            self.log_message(f"LED parse error: {e}", 'error')
-
-    def send_can_messages(self):
-        """Send current vehicle state as CAN messages"""
+    def process_lines(self, lines, frame=None, error=None):
+        """Process a batch of lines received from serial.
+
+        `frame` is the newest valid LED frame of the batch, already decoded
+        by read_loop, and `error` the parse error of a newer malformed one.
+        Only that frame is drawn; older ones would be overwritten before the
+        screen refreshes, but still count towards FPS.
+        """
+        latest_led = None
+        led_frames = 0
+        for line in lines:
+            if line.startswith("LED:"):
+                latest_led = line
+                led_frames += 1
+            else:
+                self.log_message(f"RX: {line}", 'rx')
+
+        if error is not None:
+            self.log_message(f"LED parse error: {error}", 'error')
+        if frame is not None:
+            self.process_led_data(frame, led_frames)
+        if latest_led is not None and self.show_led_var.get():
+            self.log_message(f"RX: {latest_led[:80]}...", 'led')
+
+    def process_led_data(self, frame, frames=1):
+        """Update visualization and stats from a decoded (hex_data, colors) frame"""
+        hex_data, colors = frame
+        if colors is not None:
+            self.led_strip.set_led_colors(colors)
+
+        # Update stats
+        self.frame_count += frames
+        self.frame_label.config(text=f"Frames: {self.frame_count}")
+
+        now = time.time()
+        if now - self.last_fps_time >= 1.0:
+            self.fps = self.frame_count / (now - self.last_fps_time)
+            self.frame_count = 0
+            self.last_fps_time = now
+            self.fps_label.config(text=f"FPS: {self.fps:.1f}")
+
+        self.data_label.config(text=f"LEDs: {len(hex_data) // 6}")
+
+    def send_can_messages(self, force=True):
+        """Send current vehicle state as CAN messages
+
+        With force=False, frames whose payload matches the last one sent
+        for that ID are skipped.
+        """
         if not self.ser or not self.ser.is_open:
             return
 
+        # Read each Tk variable once per cycle
         rpm = self.rpm_var.get()
         tps = self.tps_var.get()
         coolant = self.coolant_var.get()
         oil = self.oil_var.get()
         ignition = self.ignition_var.get()
-
-        gear_map = {"N": 0, "1": 1, "2": 2, "3": 3, "4": 4, "5": 5, "6": 6}
-        gear = gear_map.get(self.gear_var.get(), 0)
+        gear = CANMessageBuilder.GEAR_CODES.get(self.gear_var.get(), 0)
 
         # Build and send messages
         messages = CANMessageBuilder.build_link_generic_messages(
             rpm, tps, coolant, oil, 0, gear, ignition
         )
 
+        last_tx = self._last_tx
+        cmds = []
         for can_id, dlc, data in messages:
-            cmd = CANMessageBuilder.format_serial_command(can_id, dlc, data)
-            self.ser.write((cmd + '\n').encode())
+            if not force and last_tx.get(can_id) == data:
+                continue
+            last_tx[can_id] = data
+            cmds.append(CANMessageBuilder.format_serial_command(can_id, dlc, data))
+        if not cmds:
+            return
+
+        # One write per cycle instead of one per frame
+        self.ser.write(''.join(cmd + '\n' for cmd in cmds).encode())
+        for cmd in cmds:
             self.log_message(f"TX: {cmd}", 'tx')
 
     def send_once(self):
@@ -525,50 +621,87 @@ class LEDStripEmulator:
             return
 
         if self.cyclic_running:
-            self.cyclic_running = False
+            self._stop_cyclic()
             self.cyclic_btn.config(text="Start Cyclic")
             self.tx_status.config(text="Stopped", foreground='#888888')
         else:
             self.cyclic_running = True
             self.cyclic_btn.config(text="Stop Cyclic")
             self.tx_status.config(text="Running...", foreground='#66ff66')
+            self._cyclic_deadline = time.monotonic()
+            self._tx_cycle = 0
+            self._cyclic_tick()
+
+    def _cyclic_tick(self):
+        """Send one cycle and re-arm the timer; runs entirely on the Tk event loop.
+
+        The next tick is aimed at a monotonic deadline advanced by the
+        interval, so send time and timer latency do not add up into drift.
+        """
+        if not (self.cyclic_running and self.running):
+            self._cyclic_after_id = None
+            return
 
-            self.send_thread = threading.Thread(target=self.cyclic_send_loop, daemon=True)
-            self.send_thread.start()
+        self.send_can_messages(force=self._tx_cycle % self.FULL_REFRESH_CYCLES == 0)
+        self._tx_cycle += 1
 
-    def cyclic_send_loop(self):
-        """Background thread for cyclic transmission"""
-        while self.cyclic_running and self.running:
-            try:
-                interval = int(self.interval_var.get()) / 1000.0
-            except ValueError:
-                interval = 0.1
-
-            self.root.after(0, self.send_can_messages)
-            time.sleep(interval)
+        try:
+            interval = max(1, int(self.interval_var.get())) / 1000.0
+        except ValueError:
+            interval = 0.1
+        now = time.monotonic()
+        self._cyclic_deadline += interval
+        if self._cyclic_deadline < now:
+            # Fell behind (e.g. a busy UI); resync rather than burst
+            self._cyclic_deadline = now
+        delay_ms = int((self._cyclic_deadline - now) * 1000)
+        self._cyclic_after_id = self.root.after(delay_ms, self._cyclic_tick)
+
+    def _stop_cyclic(self):
+        self.cyclic_running = False
+        if self._cyclic_after_id is not None:
+            self.root.after_cancel(self._cyclic_after_id)
+            self._cyclic_after_id = None
 
     def log_message(self, text, tag='rx'):
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
 
+        # Lines are buffered and written to the widget at most ~30 times a second
+        self._log_pending.append((timestamp, text, tag))
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after(33, self._flush_log)
+
+    def _flush_log(self):
+        """Write all pending log lines with a single Text insert"""
+        self._log_flush_scheduled = False
+        pending, self._log_pending = self._log_pending, []
+        if not pending:
+            return
+
+        args = []
+        for timestamp, text, tag in pending:
+            args += (f"[{timestamp}] ", 'timestamp', f"{text}\n", tag)
+
         self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, f"[{timestamp}] ", 'timestamp')
-        self.log_text.insert(tk.END, f"{text}\n", tag)
+        self.log_text.insert(tk.END, *args)
+        self.log_line_count += len(pending)
+
+        # Limit log size: let it grow to 1200 lines, then cut back to 1000
+        # in one delete so the widget reflows once per ~200 lines
+        if self.log_line_count > 1200:
+            overflow = self.log_line_count - 1000
+            self.log_text.delete('1.0', f'{overflow + 1}.0')
+            self.log_line_count = 1000
         self.log_text.config(state='disabled')
 
         if self.autoscroll_var.get():
             self.log_text.see(tk.END)
 
-        self.log_line_count += 1
         self.log_count_label.config(text=f"Lines: {self.log_line_count}")
 
-        # Limit log size
-        if self.log_line_count > 1000:
-            self.log_text.config(state='normal')
-            self.log_text.delete('1.0', '100.0')
-            self.log_text.config(state='disabled')
-            self.log_line_count -= 100
-
     def clear_log(self):
+        self._log_pending = []
         self.log_text.config(state='normal')
         self.log_text.delete('1.0', tk.END)
         self.log_text.config(state='disabled')
@@ -8,9 +8,11 @@ Features real-time log, custom message editor, and message queue management.
 import serial
 import serial.tools.list_ports
 import struct
+import sys
 import time
 import threading
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox
 
@@ -19,64 +21,103 @@ from tkinter import ttk, messagebox
 PROTOCOL_TEMPLATES = {
     "Link Generic Dashboard": [
         # 0x5F0: RPM (u32 LE) + TPS*10 (u16 LE) = 800, 0
-        {"id": 0x5F0, "name": "RPM & TPS", "dlc": 8, "data": [0x20,0x03,0x00,0x00, 0x00,0x00, 0x00,0x00], "enabled": True,
+        {"id": 0x5F0, "name": "RPM & TPS", "dlc": 8, "data": bytes([0x20,0x03,0x00,0x00, 0x00,0x00, 0x00,0x00]), "enabled": True,
          "fields": [("RPM", 0, 4, "u32", 1), ("TPS", 4, 2, "u16", 0.1)]},
         # 0x5F3: Coolant*10 (u16) + AirTemp*10 (u16) = 850, 250
-        {"id": 0x5F3, "name": "Temperatures", "dlc": 8, "data": [0x52,0x03, 0xFA,0x00, 0x00,0x00,0x00,0x00], "enabled": True,
+        {"id": 0x5F3, "name": "Temperatures", "dlc": 8, "data": bytes([0x52,0x03, 0xFA,0x00, 0x00,0x00,0x00,0x00]), "enabled": True,
          "fields": [("Coolant", 0, 2, "u16", 0.1), ("AirTemp", 2, 2, "u16", 0.1)]},
         # 0x5F4: Battery*100 (u16) + Flags = 1400, 0x80 (ignition on)
-        {"id": 0x5F4, "name": "Voltage & Flags", "dlc": 8, "data": [0x78,0x05, 0x80, 0x00,0x00,0x00,0x00,0x00], "enabled": True,
+        {"id": 0x5F4, "name": "Voltage & Flags", "dlc": 8, "data": bytes([0x78,0x05, 0x80, 0x00,0x00,0x00,0x00,0x00]), "enabled": True,
          "fields": [("Battery", 0, 2, "u16", 0.01), ("Flags", 2, 1, "u8", 1)]},
         # 0x5F5: Gear + pad + OilPressure*100 (u16) = 0, 450
-        {"id": 0x5F5, "name": "Gear & Oil", "dlc": 8, "data": [0x00,0x00, 0xC2,0x01, 0x00,0x00,0x00,0x00], "enabled": True,
+        {"id": 0x5F5, "name": "Gear & Oil", "dlc": 8, "data": bytes([0x00,0x00, 0xC2,0x01, 0x00,0x00,0x00,0x00]), "enabled": True,
          "fields": [("Gear", 0, 1, "u8", 1), ("OilPressure", 2, 2, "u16", 0.01)]},
         # 0x5F6: Speed*10 (u16) = 0
-        {"id": 0x5F6, "name": "Speed", "dlc": 8, "data": [0x00,0x00, 0x00,0x00,0x00,0x00,0x00,0x00], "enabled": True,
+        {"id": 0x5F6, "name": "Speed", "dlc": 8, "data": bytes([0x00,0x00, 0x00,0x00,0x00,0x00,0x00,0x00]), "enabled": True,
          "fields": [("Speed", 0, 2, "u16", 0.1)]},
     ],
     "Link Generic Dashboard 2": [
         # 0x2000: RPM (u16) + TPS*10 (u16) + Coolant*10 (u16) + AirTemp*10 (u16)
-        {"id": 0x2000, "name": "Engine Data 1", "dlc": 8, "data": [0x20,0x03, 0x00,0x00, 0x52,0x03, 0xFA,0x00], "enabled": True,
+        {"id": 0x2000, "name": "Engine Data 1", "dlc": 8, "data": bytes([0x20,0x03, 0x00,0x00, 0x52,0x03, 0xFA,0x00]), "enabled": True,
          "fields": [("RPM", 0, 2, "u16", 1), ("TPS", 2, 2, "u16", 0.1), ("Coolant", 4, 2, "u16", 0.1), ("AirTemp", 6, 2, "u16", 0.1)]},
         # 0x2001: MAP (u16) + Battery*100 (u16) + FuelPressure (u16) + OilPressure*10 (u16)
-        {"id": 0x2001, "name": "Engine Data 2", "dlc": 8, "data": [0xE8,0x03, 0x78,0x05, 0x2C,0x01, 0x2D,0x00], "enabled": True,
+        {"id": 0x2001, "name": "Engine Data 2", "dlc": 8, "data": bytes([0xE8,0x03, 0x78,0x05, 0x2C,0x01, 0x2D,0x00]), "enabled": True,
          "fields": [("MAP", 0, 2, "u16", 1), ("Battery", 2, 2, "u16", 0.01), ("FuelPressure", 4, 2, "u16", 1), ("OilPressure", 6, 2, "u16", 0.1)]},
         # 0x2004: Speed*10 (u16) + Gear (u8) + Flags (u8)
-        {"id": 0x2004, "name": "Vehicle Data", "dlc": 8, "data": [0x00,0x00, 0x00, 0x80, 0x00,0x00,0x00,0x00], "enabled": True,
+        {"id": 0x2004, "name": "Vehicle Data", "dlc": 8, "data": bytes([0x00,0x00, 0x00, 0x80, 0x00,0x00,0x00,0x00]), "enabled": True,
          "fields": [("Speed", 0, 2, "u16", 0.1), ("Gear", 2, 1, "u8", 1), ("Flags", 3, 1, "u8", 1)]},
     ],
     "Custom": [
-        {"id": 0x100, "name": "Throttle", "dlc": 1, "data": [0x00], "enabled": True, "fields": []},
-        {"id": 0x101, "name": "Brake", "dlc": 3, "data": [0x00,0x00,0x00], "enabled": True, "fields": []},
-        {"id": 0x102, "name": "RPM", "dlc": 2, "data": [0x20,0x03], "enabled": True, "fields": []},  # 800
-        {"id": 0x103, "name": "Coolant", "dlc": 2, "data": [0x52,0x03], "enabled": True, "fields": []},  # 850 = 85.0°C
-        {"id": 0x104, "name": "Oil Pressure", "dlc": 2, "data": [0x2D,0x00], "enabled": True, "fields": []},  # 45 = 4.5bar
-        {"id": 0x105, "name": "Flags", "dlc": 1, "data": [0x00], "enabled": True, "fields": []},
-        {"id": 0x106, "name": "Ignition", "dlc": 1, "data": [0x01], "enabled": True, "fields": []},
+        {"id": 0x100, "name": "Throttle", "dlc": 1, "data": bytes([0x00]), "enabled": True, "fields": []},
+        {"id": 0x101, "name": "Brake", "dlc": 3, "data": bytes([0x00,0x00,0x00]), "enabled": True, "fields": []},
+        {"id": 0x102, "name": "RPM", "dlc": 2, "data": bytes([0x20,0x03]), "enabled": True, "fields": []},  # 800
+        {"id": 0x103, "name": "Coolant", "dlc": 2, "data": bytes([0x52,0x03]), "enabled": True, "fields": []},  # 850 = 85.0°C
+        {"id": 0x104, "name": "Oil Pressure", "dlc": 2, "data": bytes([0x2D,0x00]), "enabled": True, "fields": []},  # 45 = 4.5bar
+        {"id": 0x105, "name": "Flags", "dlc": 1, "data": bytes([0x00]), "enabled": True, "fields": []},
+        {"id": 0x106, "name": "Ignition", "dlc": 1, "data": bytes([0x01]), "enabled": True, "fields": []},
     ],
 }
 
 
 class CANMessage:
     def __init__(self, can_id=0x100, name="New Message", dlc=8, data=None, enabled=True):
+        self._wire = None
         self.id = can_id
         self.name = name
         self.dlc = dlc
-        self.data = data if data else [0] * dlc
+        self.data = data if data else bytes(dlc)
         self.enabled = enabled
 
+    # id/dlc/data invalidate the cached wire line. data is held as immutable
+    # bytes, so it can only change through the setter
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+        self._wire = None
+
+    @property
+    def dlc(self):
+        return self._dlc
+
+    @dlc.setter
+    def dlc(self, value):
+        self._dlc = value
+        self._wire = None
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = bytes(value)  # also rejects values outside 0x00-0xFF
+        self._wire = None
+
     def to_serial_format(self):
         """Convert to serial protocol format: CAN:ID:DLC:HEXDATA"""
-        hex_data = ''.join(f'{b:02X}' for b in self.data[:self.dlc])
+        hex_data = self.data[:self.dlc].hex().upper()
         return f"CAN:{self.id:03X}:{self.dlc}:{hex_data}"
 
+    def encoded(self):
+        """Newline-terminated serial line as bytes, cached until id/dlc/data change"""
+        if self._wire is None:
+            self._wire = (self.to_serial_format() + "\n").encode()
+        return self._wire
+
     def get_display_string(self):
         """Get formatted display string"""
-        hex_data = ' '.join(f'{b:02X}' for b in self.data[:self.dlc])
+        hex_data = self.data[:self.dlc].hex(' ').upper()
         return f"0x{self.id:03X} [{self.dlc}] {hex_data}"
 
 
 class SerialCANEmulator:
+    __slots__ = ('ser', 'messages', 'running', 'cyclic_thread', 'log_callback', 'interval',
+                 '_stop_evt', '_cycle', '_write')
+
     def __init__(self):
         self.ser = None
         self.messages = []
@@ -84,16 +125,33 @@ class SerialCANEmulator:
         self.cyclic_thread = None
         self.log_callback = None
         self.interval = 0.1
+        self._stop_evt = threading.Event()
+        # (enabled messages, their joined wire bytes), swapped as one tuple
+        # so the cyclic thread never sees a half-updated pair
+        self._cycle = ((), b'')
+        # Bound ser.write while connected, else None; saves the is_open
+        # check and attribute chain on every send
+        self._write = None
+
+    def refresh_enabled(self):
+        """Rebuild the per-cycle send view; call after any change to messages"""
+        enabled = tuple(msg for msg in self.messages if msg.enabled)
+        self._cycle = (enabled, b''.join(msg.encoded() for msg in enabled))
 
     def connect(self, port, baudrate=115200):
         try:
             self.ser = serial.Serial(port, baudrate, timeout=0.1)
+            if hasattr(self.ser, 'set_buffer_size'):
+                # Windows only: the default driver queues are 4 KiB
+                self.ser.set_buffer_size(rx_size=65536, tx_size=65536)
+            self._write = self.ser.write
             return True, f"Connected to {port}"
         except serial.SerialException as e:
             return False, str(e)
 
     def disconnect(self):
         self.stop_cyclic()
+        self._write = None
         if self.ser:
             self.ser.close()
             self.ser = None
@@ -102,36 +160,67 @@ class SerialCANEmulator:
         return self.ser is not None and self.ser.is_open
 
     def send_message(self, msg):
-        if not self.is_connected() or not msg.enabled:
+        write = self._write
+        if write is None or not msg.enabled:
             return
-        cmd = msg.to_serial_format() + "\n"
-        self.ser.write(cmd.encode())
+        write(msg.encoded())
         if self.log_callback:
             self.log_callback(msg)
 
     def send_all_enabled(self):
-        for msg in self.messages:
-            if msg.enabled:
-                self.send_message(msg)
+        write = self._write
+        sent, payload = self._cycle
+        if write is None or not payload:
+            return
+        # One write per cycle instead of one per message
+        write(payload)
+        if self.log_callback:
+            for msg in sent:
+                self.log_callback(msg)
 
     def start_cyclic(self, interval=0.1):
         if self.running:
             return
         self.interval = interval
         self.running = True
+        self._stop_evt.clear()
         self.cyclic_thread = threading.Thread(target=self._cyclic_loop, daemon=True)
         self.cyclic_thread.start()
 
     def stop_cyclic(self):
         self.running = False
+        self._stop_evt.set()
         if self.cyclic_thread:
             self.cyclic_thread.join(timeout=1)
             self.cyclic_thread = None
 
     def _cyclic_loop(self):
-        while self.running:
-            self.send_all_enabled()
-            time.sleep(self.interval)
+        """Send every interval against a monotonic deadline.
+
+        Send time does not accumulate as drift, and stop_cyclic wakes the
+        wait immediately instead of joining for up to a full interval.
+        """
+        winmm = None
+        if sys.platform == 'win32':
+            # Default Windows timer granularity is ~15.6 ms
+            import ctypes
+            winmm = ctypes.WinDLL('winmm')
+            winmm.timeBeginPeriod(1)
+        try:
+            next_t = time.monotonic()
+            while self.running:
+                self.send_all_enabled()
+                next_t += self.interval
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    if self._stop_evt.wait(delay):
+                        break
+                else:
+                    # Fell behind; resync rather than bursting to catch up
+                    next_t = time.monotonic()
+        finally:
+            if winmm is not None:
+                winmm.timeEndPeriod(1)
 
     def load_protocol(self, protocol_name):
         self.messages.clear()
@@ -141,13 +230,17 @@ class SerialCANEmulator:
                     can_id=tmpl["id"],
                     name=tmpl["name"],
                     dlc=tmpl["dlc"],
-                    data=tmpl["data"].copy(),
+                    data=tmpl["data"],
                     enabled=tmpl["enabled"]
                 )
                 self.messages.append(msg)
+        self.refresh_enabled()
 
 
 class EmulatorGUI:
+    PORTS_CACHE_S = 2.0  # reuse a port scan for repeat Refresh clicks
+    LOG_MAX_LINES = 5000  # older log lines are dropped past this
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Serial CAN Emulator")
@@ -155,9 +248,16 @@ class EmulatorGUI:
         self.root.minsize(900, 600)
 
         self.emulator = SerialCANEmulator()
-        self.emulator.log_callback = self.log_message
+        self.emulator.log_callback = self._on_message_sent
         self.selected_msg_idx = None
         self.log_counter = 0
+        self._log_lines = 0
+        self._log_pending = deque()
+        self._log_flush_scheduled = False
+        self._preview_pending = False
+        self._port_pool = ThreadPoolExecutor(max_workers=1)
+        self._ports_future = None
+        self._ports_cache = (0.0, None)
 
         self.create_widgets()
         self.refresh_ports()
@@ -275,13 +375,15 @@ class EmulatorGUI:
 
         ttk.Label(row2, text="Data (hex):").pack(side='left')
         self.data_entries = []
+        self.data_vars = []
         for i in range(8):
             lbl = ttk.Label(row2, text=f"B{i}:", font=('Consolas', 8))
             lbl.pack(side='left', padx=(10,0))
-            entry = ttk.Entry(row2, width=4, font=('Consolas', 10))
-            entry.insert(0, "00")
+            var = tk.StringVar(value="00")
+            entry = ttk.Entry(row2, textvariable=var, width=4, font=('Consolas', 10))
             entry.pack(side='left', padx=2)
             self.data_entries.append(entry)
+            self.data_vars.append(var)
 
         # Apply button
         row3 = ttk.Frame(editor_frame)
@@ -294,11 +396,11 @@ class EmulatorGUI:
         self.preview_var = tk.StringVar(value="CAN:100:8:0000000000000000")
         ttk.Label(row3, textvariable=self.preview_var, font=('Consolas', 9), foreground='blue').pack(side='left')
 
-        # Bind data entries to update preview
-        for entry in self.data_entries:
-            entry.bind('<KeyRelease>', self.update_preview)
-        self.id_var.trace_add('write', lambda *_: self.update_preview())
-        self.dlc_var.trace_add('write', lambda *_: self.update_preview())
+        # Any edit (typing, paste, selecting a message) updates the preview
+        for var in self.data_vars:
+            var.trace_add('write', self._schedule_preview)
+        self.id_var.trace_add('write', self._schedule_preview)
+        self.dlc_var.trace_add('write', self._schedule_preview)
 
         # Real-time Log frame
         log_frame = ttk.LabelFrame(right_frame, text="Real-time Log", padding=5)
@@ -329,7 +431,32 @@ class EmulatorGUI:
         self.log_text.tag_config('raw', foreground='purple')
 
     def refresh_ports(self):
-        ports = serial.tools.list_ports.comports()
+        """Enumerate ports on a worker; comports() can take hundreds of ms on Windows"""
+        stamp, ports = self._ports_cache
+        if ports is not None and time.monotonic() - stamp < self.PORTS_CACHE_S:
+            self._show_ports(ports)
+            return
+        if self._ports_future is None:
+            self._ports_future = self._port_pool.submit(serial.tools.list_ports.comports)
+            self.root.after(50, self._poll_ports)
+
+    def _poll_ports(self):
+        future = self._ports_future
+        if not future.done():
+            self.root.after(50, self._poll_ports)
+            return
+        self._ports_future = None
+        try:
+            ports = future.result()
+        except Exception as e:
+            # Not cached, so the next Refresh scans again
+            messagebox.showerror("Port Scan Error", str(e))
+            ports = []
+        else:
+            self._ports_cache = (time.monotonic(), ports)
+        self._show_ports(ports)
+
+    def _show_ports(self, ports):
         port_list = [f"{p.device} - {p.description}" for p in ports]
         self.port_combo['values'] = port_list
         if port_list:
@@ -365,15 +492,29 @@ class EmulatorGUI:
         self.protocol_var.set(name)
         self.on_load_protocol()
 
+    @staticmethod
+    def _queue_row_text(msg):
+        status = "+" if msg.enabled else "-"
+        return f"{status} 0x{msg.id:03X} [{msg.dlc}] {msg.name}"
+
     def refresh_queue_list(self):
+        """Rebuild every row; single edits use _update_queue_row instead"""
+        msgs = self.emulator.messages
         self.queue_listbox.delete(0, tk.END)
-        for i, msg in enumerate(self.emulator.messages):
-            status = "+" if msg.enabled else "-"
-            display = f"{status} 0x{msg.id:03X} [{msg.dlc}] {msg.name}"
-            self.queue_listbox.insert(tk.END, display)
+        self.queue_listbox.insert(tk.END, *map(self._queue_row_text, msgs))
+        # Listbox has no tags; only disabled rows need an itemconfig call
+        for i, msg in enumerate(msgs):
             if not msg.enabled:
                 self.queue_listbox.itemconfig(i, foreground='gray')
 
+    def _update_queue_row(self, idx):
+        """Redraw one queue row in place"""
+        msg = self.emulator.messages[idx]
+        self.queue_listbox.delete(idx)
+        self.queue_listbox.insert(idx, self._queue_row_text(msg))
+        if not msg.enabled:
+            self.queue_listbox.itemconfig(idx, foreground='gray')
+
     def on_message_select(self, event):
         selection = self.queue_listbox.curselection()
         if not selection:
@@ -387,19 +528,16 @@ class EmulatorGUI:
         self.name_var.set(msg.name)
         self.dlc_var.set(str(msg.dlc))
 
-        for i, entry in enumerate(self.data_entries):
-            entry.delete(0, tk.END)
-            if i < len(msg.data):
-                entry.insert(0, f"{msg.data[i]:02X}")
-            else:
-                entry.insert(0, "00")
+        for i, var in enumerate(self.data_vars):
+            var.set(f"{msg.data[i]:02X}" if i < len(msg.data) else "00")
 
-        self.update_preview()
+        self._schedule_preview()
 
     def add_message(self):
         msg = CANMessage()
         self.emulator.messages.append(msg)
-        self.refresh_queue_list()
+        self.emulator.refresh_enabled()
+        self.queue_listbox.insert(tk.END, self._queue_row_text(msg))
         # Select the new message
         self.queue_listbox.selection_clear(0, tk.END)
         self.queue_listbox.selection_set(len(self.emulator.messages) - 1)
@@ -412,7 +550,8 @@ class EmulatorGUI:
             messagebox.showwarning("Warning", "Cannot delete the last message")
             return
         del self.emulator.messages[self.selected_msg_idx]
-        self.refresh_queue_list()
+        self.emulator.refresh_enabled()
+        self.queue_listbox.delete(self.selected_msg_idx)
         self.selected_msg_idx = None
 
     def move_message(self, direction):
@@ -423,8 +562,11 @@ class EmulatorGUI:
         if 0 <= new_idx < len(self.emulator.messages):
             msgs = self.emulator.messages
             msgs[idx], msgs[new_idx] = msgs[new_idx], msgs[idx]
+            self.emulator.refresh_enabled()
             self.selected_msg_idx = new_idx
-            self.refresh_queue_list()
+            self._update_queue_row(idx)
+            self._update_queue_row(new_idx)
+            self.queue_listbox.selection_clear(0, tk.END)
             self.queue_listbox.selection_set(new_idx)
 
     def toggle_message(self):
@@ -432,7 +574,8 @@ class EmulatorGUI:
             return
         msg = self.emulator.messages[self.selected_msg_idx]
         msg.enabled = not msg.enabled
-        self.refresh_queue_list()
+        self.emulator.refresh_enabled()
+        self._update_queue_row(self.selected_msg_idx)
         self.queue_listbox.selection_set(self.selected_msg_idx)
 
     def apply_message_changes(self):
@@ -440,32 +583,54 @@ class EmulatorGUI:
             messagebox.showwarning("Warning", "Select a message first")
             return
 
+        # Parse everything before touching the message so a bad field
+        # leaves it (and the cyclic send view) unchanged
         try:
-            msg = self.emulator.messages[self.selected_msg_idx]
-            msg.id = int(self.id_var.get(), 16)
-            msg.name = self.name_var.get()
-            msg.dlc = int(self.dlc_var.get())
-
-            new_data = []
-            for i in range(msg.dlc):
-                val = self.data_entries[i].get().strip()
-                new_data.append(int(val, 16) if val else 0)
-            msg.data = new_data
-
-            self.refresh_queue_list()
-            self.queue_listbox.selection_set(self.selected_msg_idx)
+            can_id = int(self.id_var.get(), 16)
+            dlc = int(self.dlc_var.get())
+            new_data = self._read_editor_data(dlc)
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid value: {e}")
+            return
+
+        msg = self.emulator.messages[self.selected_msg_idx]
+        msg.id = can_id
+        msg.name = self.name_var.get()
+        msg.dlc = dlc
+        msg.data = new_data
+        self.emulator.refresh_enabled()
+
+        self._update_queue_row(self.selected_msg_idx)
+        self.queue_listbox.selection_set(self.selected_msg_idx)
+
+    def _read_editor_data(self, dlc):
+        """Parse the first dlc data entries as one hex string; ValueError on bad input"""
+        if not 0 <= dlc <= len(self.data_vars):
+            raise ValueError(f"DLC must be 0-{len(self.data_vars)}")
+        parts = []
+        for var in self.data_vars[:dlc]:
+            text = var.get().strip()
+            if len(text) > 2 and text[:2] in ('0x', '0X'):
+                text = text[2:]  # int(val, 16) accepted the prefix too
+            part = (text or '0').zfill(2)
+            if len(part) != 2:
+                raise ValueError(f"not a single byte: {part}")
+            parts.append(part)
+        return bytes.fromhex(''.join(parts))
+
+    def _schedule_preview(self, *_):
+        # Key releases and id/dlc traces often fire together; recompute once
+        if not self._preview_pending:
+            self._preview_pending = True
+            self.root.after_idle(self.update_preview)
 
     def update_preview(self, event=None):
+        self._preview_pending = False
         try:
             can_id = int(self.id_var.get(), 16)
             dlc = int(self.dlc_var.get())
-            data_hex = ''.join(
-                self.data_entries[i].get().strip().zfill(2).upper()[:2]
-                for i in range(dlc)
-            )
-            self.preview_var.set(f"CAN:{can_id:03X}:{dlc}:{data_hex}")
+            data = self._read_editor_data(dlc)
+            self.preview_var.set(f"CAN:{can_id:03X}:{dlc}:{data.hex().upper()}")
         except ValueError:
             self.preview_var.set("Invalid input")
 
@@ -501,19 +666,54 @@ class EmulatorGUI:
             self.cyclic_btn.config(text="Stop Cyclic")
             self.tx_status.config(text="Running...", foreground='green')
 
-    def log_message(self, msg):
-        self.log_counter += 1
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        raw = msg.to_serial_format()
-        hex_data = ' '.join(f'{b:02X}' for b in msg.data[:msg.dlc])
+    def _on_message_sent(self, msg):
+        # Called from the cyclic thread too. Only the deque is touched here;
+        # widgets are updated from the main loop, at most ~20 times a second.
+        # The wire bytes are captured now so a later edit can't change what
+        # the log shows as sent
+        self._log_pending.append((msg.encoded(), time.time_ns()))
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after(50, self._flush_log)
+
+    def _flush_log(self):
+        """Write all pending log entries with a single Text insert"""
+        self._log_flush_scheduled = False
+        pending = self._log_pending
+        args = []
+        count = 0
+        # Most of a flush falls within the same second; format HH:MM:SS once
+        last_sec = None
+        hms = ''
+        while pending:
+            wire, sent_ns = pending.popleft()
+            sec, ns = divmod(sent_ns, 1_000_000_000)
+            if sec != last_sec:
+                last_sec = sec
+                hms = time.strftime("%H:%M:%S", time.localtime(sec))
+            timestamp = f"{hms}.{ns // 1_000_000:03d}"
+            raw = wire[:-1].decode()  # CAN:ID:DLC:HEX without the newline
+            _, id_hex, dlc, data_hex = raw.split(':')
+            hex_data = bytes.fromhex(data_hex).hex(' ').upper()
+            args += (f"[{timestamp}] ", 'timestamp',
+                     f"0x{id_hex} ", 'id',
+                     f"[{dlc}] ", '',
+                     f"{hex_data} ", 'data',
+                     f"| {raw}\n", 'raw')
+            count += 1
+        if not count:
+            return
 
         self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, f"[{timestamp}] ", 'timestamp')
-        self.log_text.insert(tk.END, f"0x{msg.id:03X} ", 'id')
-        self.log_text.insert(tk.END, f"[{msg.dlc}] ", '')
-        self.log_text.insert(tk.END, f"{hex_data} ", 'data')
-        self.log_text.insert(tk.END, f"| {raw}\n", 'raw')
+        self.log_text.insert(tk.END, *args)
+        # Keep only the newest lines; one delete per flush at most
+        self._log_lines += count
+        if self._log_lines > self.LOG_MAX_LINES:
+            drop = self._log_lines - self.LOG_MAX_LINES
+            self.log_text.delete('1.0', f'{drop + 1}.0')
+            self._log_lines = self.LOG_MAX_LINES
         self.log_text.config(state='disabled')
+        self.log_counter += count
 
         if self.autoscroll_var.get():
             self.log_text.see(tk.END)
@@ -521,15 +721,18 @@ class EmulatorGUI:
         self.log_count_label.config(text=f"Messages: {self.log_counter}")
 
     def clear_log(self):
+        self._log_pending.clear()
         self.log_text.config(state='normal')
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state='disabled')
         self.log_counter = 0
+        self._log_lines = 0
         self.log_count_label.config(text="Messages: 0")
 
     def run(self):
         self.root.mainloop()
         self.emulator.disconnect()
+        self._port_pool.shutdown(wait=False)
 
 
 def main():